@@ -11,15 +11,23 @@ This module provides smart authentication that:
 """
 
 import asyncio
+import dataclasses
+import functools
+import hashlib
 import logging
+import os
+import re
 import time
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Dict, List, Optional, Pattern, Tuple, Any
+from dataclasses import dataclass, field
 from enum import Enum
+from urllib.parse import urljoin
 
 import aiohttp
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright, Browser, Page, BrowserContext
+from bs4 import BeautifulSoup, SoupStrainer
+from playwright.async_api import async_playwright, Browser, Page, BrowserContext, Playwright, Route
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 # Configure logging for Hebrew support
 logging.basicConfig(
@@ -31,6 +39,135 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# מספר ה-BrowserContexts במאגר המשותף (וברירת המחדל למקביליות בבדיקת אצווה)
+BROWSER_POOL_SIZE = 8
+
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# כותרות לבקשות HTTP ישירות (ללא דפדפן)
+_HTTP_HEADERS = {
+    'User-Agent': _USER_AGENT,
+    'Accept-Language': 'he-IL,he;q=0.9,en-US;q=0.8,en;q=0.7'
+}
+
+# הגדרות דפדפן עם תמיכה בעברית
+_LAUNCH_ARGS = (
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--lang=he-IL',
+    '--accept-lang=he-IL,he,en-US,en'
+)
+
+_CONTEXT_OPTIONS = {
+    'locale': 'he-IL',
+    'timezone_id': 'Asia/Jerusalem',
+    'user_agent': _USER_AGENT,
+    'viewport': {'width': 1366, 'height': 768}
+}
+
+# חיפוש שם המשתמש המוצג בדף לאחר התחברות
+_USER_INFO_JS = """
+    () => {
+        const userSelectors = [
+            '.username', '.user-name', '.user-info', 
+            '[data-username]', '#user-menu', '.user-menu',
+            '.navbar-text', '.user-profile'
+        ];
+        
+        for (const selector of userSelectors) {
+            const element = document.querySelector(selector);
+            if (element && element.textContent.trim()) {
+                return element.textContent.trim();
+            }
+        }
+        
+        return null;
+    }
+"""
+
+# זיהוי CAPTCHA בדף ההתחברות (מחייב דפדפן מלא)
+_CAPTCHA_RE = re.compile(r'captcha', re.IGNORECASE)
+
+# סוגי משאבים שאינם נחוצים להתחברות (CSS נשאר - נראות האלמנטים תלויה בו)
+_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+
+# מרוץ בין אינדיקטורי שגיאה/הצלחה בתוך הדפדפן - מחזיר את הראשון שנמצא
+_INDICATOR_RACE_JS = """
+    ({ errorSelector, successSelector }) => {
+        for (const element of document.querySelectorAll(errorSelector)) {
+            const text = element.textContent.trim();
+            if (text) return { kind: 'error', selector: errorSelector, text };
+        }
+        if (document.querySelector(successSelector)) {
+            return { kind: 'success', selector: successSelector };
+        }
+        return null;
+    }
+"""
+
+# אוניברסיטאות ששירות ה-token שלהן כבוי - מדלגים ישירות למסלול החלופי
+_token_service_unavailable: set = set()
+
+# בדף ההתחברות מספיק לפענח את הטפסים בלבד
+_LOGIN_FORM_STRAINER = SoupStrainer('form')
+
+# מעל גודל זה ה-HTML מפוענח ב-thread נפרד כדי לא לחסום את ה-event loop
+_LARGE_HTML_SIZE = 100_000
+
+# connector משותף לכל האימותים - שימוש חוזר בחיבורי TCP/TLS ובמטמון DNS
+_connector: Optional[aiohttp.TCPConnector] = None
+_connector_loop: Optional[asyncio.AbstractEventLoop] = None
+
+# שרתים שה-DNS וחיבור ה-TLS אליהם כבר חוממו ב-connector הנוכחי
+_warmed_hosts: set = set()
+
+# סגירות רקע של connectors שהוחלפו - הפניה חזקה עד לסיום
+_stale_closes: set = set()
+
+def get_connector() -> aiohttp.TCPConnector:
+    """
+    החזרת ה-connector המשותף עבור לולאת האירועים הנוכחית
+    
+    כל אימות פותח ClientSession קל משלו (cookie jar נפרד למשתמש)
+    מעל ה-connector הזה, כך שחיבורי keep-alive ו-TLS נשמרים בין אימותים.
+    """
+    global _connector, _connector_loop
+    
+    loop = asyncio.get_running_loop()
+    if _connector is None or _connector.closed or _connector_loop is not loop:
+        # חיבורים חמים שייכים ל-connector שמוחלף - רק אז הרשימה מתאפסת
+        if _connector is not None:
+            _warmed_hosts.clear()
+            # connector מלולאה קודמת (asyncio.run לכל משימת Celery) - נסגר ולא נזנח
+            if not _connector.closed:
+                task = loop.create_task(_close_stale_connector(_connector))
+                _stale_closes.add(task)
+                task.add_done_callback(_stale_closes.discard)
+        _connector = aiohttp.TCPConnector(
+            limit=100,
+            limit_per_host=20,
+            ttl_dns_cache=300,
+            keepalive_timeout=60
+        )
+        _connector_loop = loop
+    return _connector
+
+async def _close_stale_connector(connector: aiohttp.TCPConnector) -> None:
+    """סגירה מיטבית של connector שהוחלף - הלולאה שלו ייתכן שכבר נסגרה"""
+    try:
+        await connector.close()
+    except Exception as e:
+        logger.warning("⚠️ Error closing stale HTTP connector: %s", e)
+
+async def close_connector() -> None:
+    """סגירת ה-connector המשותף בסיום התהליך"""
+    global _connector
+    
+    if _connector:
+        await _connector.close()
+        _connector = None
+
 class AuthenticationResult(Enum):
     """תוצאות אימות"""
     SUCCESS = "success"
@@ -42,6 +179,13 @@ class AuthenticationResult(Enum):
     MAINTENANCE = "maintenance"
     UNKNOWN_ERROR = "unknown_error"
 
+# שגיאות login/token.php שמשמעותן תשובה ודאית על פרטי ההתחברות
+_TOKEN_SERVICE_ERRORS = {
+    'invalidlogin': (AuthenticationResult.INVALID_CREDENTIALS, "שם משתמש או סיסמה שגויים", "Invalid username or password"),
+    'usersuspended': (AuthenticationResult.ACCOUNT_LOCKED, "החשבון נחסם או מושעה", "Account is locked or suspended"),
+    'sitemaintenance': (AuthenticationResult.MAINTENANCE, "המערכת במצב תחזוקה כעת", "System is under maintenance")
+}
+
 @dataclass
 class ValidationResult:
     """תוצאת אימות פרטי התחברות"""
@@ -55,49 +199,291 @@ class ValidationResult:
     session_data: Optional[Dict[str, Any]] = None
     error_details: Optional[str] = None
 
+# מטמון קצר-טווח לתוצאות אימות - חוסך פניה חוזרת לשרת בבדיקות חוזרות
+_RESULT_CACHE_TTL = 60  # שניות
+_RESULT_CACHE_SIZE = 1024
+_RESULT_CACHE_SALT = os.urandom(16)
+_result_cache: 'OrderedDict[str, Tuple[float, ValidationResult]]' = OrderedDict()
+
+# תוצאות זמניות שאסור לשמור במטמון
+_UNCACHEABLE_RESULTS = frozenset({
+    AuthenticationResult.NETWORK_ERROR,
+    AuthenticationResult.TIMEOUT,
+    AuthenticationResult.UNKNOWN_ERROR
+})
+
+def _result_cache_key(university: str, username: str, password: str) -> str:
+    """מפתח מטמון - hash ממולח, כך שפרטי ההתחברות לא נשמרים בזיכרון"""
+    return hashlib.blake2b(
+        '\0'.join((university, username, password)).encode(),
+        key=_RESULT_CACHE_SALT,
+        digest_size=16
+    ).hexdigest()
+
+def _get_cached_result(key: str) -> Optional[ValidationResult]:
+    """החזרת תוצאה מהמטמון אם עדיין בתוקף"""
+    entry = _result_cache.get(key)
+    if not entry:
+        return None
+    
+    stored_at, result = entry
+    if time.monotonic() - stored_at > _RESULT_CACHE_TTL:
+        del _result_cache[key]
+        return None
+    
+    _result_cache.move_to_end(key)
+    return dataclasses.replace(result)
+
+def _cache_result(key: str, result: ValidationResult) -> None:
+    """שמירת תוצאה במטמון (LRU)"""
+    if result.result in _UNCACHEABLE_RESULTS:
+        return
+    
+    _result_cache[key] = (time.monotonic(), dataclasses.replace(result))
+    _result_cache.move_to_end(key)
+    if len(_result_cache) > _RESULT_CACHE_SIZE:
+        _result_cache.popitem(last=False)
+
+def clear_cache() -> None:
+    """ניקוי מטמון תוצאות האימות"""
+    _result_cache.clear()
+
+@dataclass(frozen=True, slots=True)
+class MoodleSiteConfig:
+    """תצורת מערכת מודל של אוניברסיטה"""
+    id: str
+    name: str
+    moodle_url: str
+    login_path: str
+    username_field: str
+    password_field: str
+    login_button: str
+    form_selector: str
+    error_selectors: Tuple[str, ...]
+    success_indicators: Tuple[str, ...]
+    # מילות מפתח בתוכן הדף - מהודרות מראש לסריקה יחידה ללא lower() על כל ה-HTML
+    maintenance_re: Pattern[str]
+    dashboard_re: Pattern[str]
+    dashboard_indicators: Tuple[str, ...] = ()
+    token_service_path: Optional[str] = None  # Moodle web service login
+    
+    # מחושבים מראש - סלקטור CSS יחיד (OR) במקום לולאה על הרשימה
+    login_url: str = field(init=False)
+    error_selector: str = field(init=False)
+    success_selector: str = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'login_url', f"{self.moodle_url}{self.login_path}")
+        object.__setattr__(self, 'error_selector', ', '.join(self.error_selectors))
+        object.__setattr__(self, 'success_selector', ', '.join(self.success_indicators))
+
 class UniversityConfig:
     """תצורת אוניברסיטה"""
     
-    BGU = {
-        'id': 'bgu',
-        'name': 'אוניברסיטת בן-גוריון בנגב',
-        'moodle_url': 'https://moodle.bgu.ac.il',
-        'login_path': '/moodle/local/mydashboard/',
-        'dashboard_indicators': [
+    BGU = MoodleSiteConfig(
+        id='bgu',
+        name='אוניברסיטת בן-גוריון בנגב',
+        moodle_url='https://moodle.bgu.ac.il',
+        login_path='/moodle/local/mydashboard/',
+        token_service_path='/moodle/login/token.php',
+        dashboard_indicators=(
             'dashboard',
             'my',
             'course',
             'grades',
             'profile'
-        ],
-        'login_form_selectors': {
-            'username_field': '#login_username',   # Updated from analysis
-            'password_field': '#login_password',   # Updated from analysis  
-            'login_button': 'input[type="submit"]', # Updated from analysis
-            'form': '#login'
-        },
-        'error_selectors': [
+        ),
+        username_field='#login_username',   # Updated from analysis
+        password_field='#login_password',   # Updated from analysis
+        login_button='input[type="submit"]', # Updated from analysis
+        form_selector='#login',
+        error_selectors=(
             '.login-error',
             '.alert-danger',
             '#loginerrormsg',
             '.error'
-        ],
-        'success_indicators': [
+        ),
+        success_indicators=(
             '.dashboard',
             '#page-my-index',
             '.my-courses',
             'nav[aria-label="Site"]'
-        ]
-    }
+        ),
+        maintenance_re=re.compile(r'maintenance|תחזוקה|זמנית לא זמין', re.IGNORECASE),
+        dashboard_re=re.compile(r'dashboard|my courses|הקורסים שלי|לוח המחוונים', re.IGNORECASE)
+    )
     
     # Additional universities can be added here
     SUPPORTED_UNIVERSITIES = {
         'bgu': BGU
     }
 
+async def _block_heavy_resources(route: Route) -> None:
+    """חסימת תמונות, מדיה ופונטים בזמן ההתחברות"""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def _parse_html(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """פענוח HTML עם lxml"""
+    if len(html) < _LARGE_HTML_SIZE:
+        return BeautifulSoup(html, 'lxml', parse_only=parse_only)
+    
+    return await asyncio.get_running_loop().run_in_executor(
+        None, functools.partial(BeautifulSoup, html, 'lxml', parse_only=parse_only)
+    )
+
+class _TokenBucket:
+    """מגביל קצב (token bucket) למניעת חסימה מצד שרת האוניברסיטה"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """המתנה עד שיש אסימון פנוי"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+# מגביל קצב משותף לכל בדיקות האצווה בתהליך - אצוות מקבילות חולקות תקרה אחת
+_batch_rate_limiter: Optional[_TokenBucket] = None
+_batch_rate_limiter_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_batch_rate_limiter(rate: float) -> _TokenBucket:
+    """החזרת המגביל המשותף עבור לולאת האירועים הנוכחית (הקריאה האחרונה קובעת את הקצב)"""
+    global _batch_rate_limiter, _batch_rate_limiter_loop
+    
+    loop = asyncio.get_running_loop()
+    if _batch_rate_limiter is None or _batch_rate_limiter_loop is not loop:
+        _batch_rate_limiter = _TokenBucket(rate=rate, capacity=BROWSER_POOL_SIZE)
+        _batch_rate_limiter_loop = loop
+    else:
+        _batch_rate_limiter.rate = rate
+    return _batch_rate_limiter
+
+class BrowserPool:
+    """
+    מאגר BrowserContext מחוממים מעל דפדפן משותף יחיד
+    
+    הפעלת דפדפן עולה מאות מילישניות, בעוד ש-context חדש זול בסדרי גודל.
+    כל אימות מקבל context נקי מהמאגר; בסיום ה-context נסגר ומוחלף ברקע
+    ב-context חדש, כך שאין צורך לנקות cookies ו-storage בין משתמשים.
+    """
+    
+    def __init__(self, size: int = BROWSER_POOL_SIZE, headless: bool = True):
+        """
+        Args:
+            size: מספר ה-contexts במאגר
+            headless: האם להריץ בדפדפן נסתר
+        """
+        self.size = size
+        self.headless = headless
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._contexts: asyncio.Queue = asyncio.Queue()
+        self._replacements: set = set()
+        self._lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """הפעלת הדפדפן ויצירת ה-contexts מראש (אם טרם הופעל)"""
+        async with self._lock:
+            if self._browser and self._browser.is_connected():
+                return
+            
+            if not self._playwright:
+                self._playwright = await async_playwright().start()
+            
+            # Launch browser with Hebrew support
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.headless,
+                args=list(_LAUNCH_ARGS)
+            )
+            
+            self._contexts = asyncio.Queue()
+            for context in await asyncio.gather(*(self._new_context() for _ in range(self.size))):
+                self._contexts.put_nowait(context)
+            
+            logger.info("🌐 Browser pool initialized with %s contexts", self.size)
+
+    async def _new_context(self) -> BrowserContext:
+        """יצירת context חדש עם תצורה מותאמת לעברית"""
+        context = await self._browser.new_context(**_CONTEXT_OPTIONS)
+        await context.route('**/*', _block_heavy_resources)
+        return context
+
+    async def acquire(self) -> BrowserContext:
+        """השאלת context מהמאגר (ממתין אם כולם בשימוש)"""
+        await self.start()
+        context = await self._contexts.get()
+        if context is None:
+            # יצירת context חלופי נכשלה ברקע - ניסיון נוסף כעת
+            try:
+                context = await self._new_context()
+            except Exception:
+                self._contexts.put_nowait(None)
+                raise
+        return context
+
+    def release(self, context: BrowserContext) -> None:
+        """החזרת context - נסגר ומוחלף ברקע ב-context נקי"""
+        task = asyncio.get_running_loop().create_task(self._replace(context))
+        self._replacements.add(task)
+        task.add_done_callback(self._replacements.discard)
+
+    async def _replace(self, context: BrowserContext) -> None:
+        """סגירת context משומש והוספת context חדש למאגר"""
+        try:
+            await context.close()
+        except Exception as e:
+            logger.warning("⚠️ Error closing browser context: %s", e)
+        
+        if context.browser is not self._browser:
+            # context מדפדפן קודם שקרס - המאגר החדש כבר מלא
+            return
+        
+        try:
+            self._contexts.put_nowait(await self._new_context())
+        except Exception as e:
+            logger.warning("⚠️ Error creating browser context: %s", e)
+            self._contexts.put_nowait(None)
+
+    async def close(self) -> None:
+        """סגירת הדפדפן המשותף"""
+        # החלפות מלולאה קודמת לא ניתנות להמתנה מהלולאה הנוכחית
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(task for task in self._replacements if task.get_loop() is loop),
+            return_exceptions=True
+        )
+        
+        async with self._lock:
+            if self._browser:
+                await self._browser.close()
+                self._browser = None
+            if self._playwright:
+                await self._playwright.stop()
+                self._playwright = None
+            
+            logger.info("🧹 Browser pool closed")
+
 class SmartMoodleValidator:
     """מאמת חכם למערכות מודל"""
     
+    # דפדפן משותף לכל האימותים - אחד לכל event loop
+    _pool: Optional[BrowserPool] = None
+    _pool_loop: Optional[asyncio.AbstractEventLoop] = None
+    
     def __init__(self, university: str = 'bgu', headless: bool = True, timeout: int = 30000):
         """
         אתחול המאמת החכם
@@ -114,104 +500,96 @@ class SmartMoodleValidator:
         
         if not self.config:
             raise ValueError(f"אוניברסיטה לא נתמכת: {university}")
-            
-        self.browser: Optional[Browser] = None
-        self.context: Optional[BrowserContext] = None
-        self.page: Optional[Page] = None
         
-        logger.info(f"🎓 Smart Validator initialized for {self.config['name']}")
+        # חימום DNS ו-TLS ברקע כשנוצרים מתוך event loop פעיל
+        self._warmup_task: Optional[asyncio.Task] = None
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        # get_connector() קודם - החלפת connector מאפסת את _warmed_hosts, וזה חייב
+        # לקרות לפני שהשרת מסומן כמחומם ולא בתוך _warmup
+        if loop and get_connector() and self.config.moodle_url not in _warmed_hosts:
+            _warmed_hosts.add(self.config.moodle_url)
+            self._warmup_task = loop.create_task(self._warmup())
+        
+        logger.info("🎓 Smart Validator initialized for %s", self.config.name)
+
+    async def _warmup(self) -> None:
+        """פתיחת חיבור מוקדם לשרת המודל, כך שהאימות הראשון לא ישלם על DNS ו-TLS"""
+        try:
+            async with aiohttp.ClientSession(
+                connector=get_connector(),
+                connector_owner=False,
+                headers=_HTTP_HEADERS
+            ) as session:
+                async with session.head(
+                    self.config.moodle_url,
+                    allow_redirects=False,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout / 1000)
+                ):
+                    pass
+            
+            logger.info("🔥 Connection to %s warmed up", self.config.moodle_url)
+            
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            _warmed_hosts.discard(self.config.moodle_url)
+            logger.warning("⚠️ Connection warm-up failed: %s", e)
+        except asyncio.CancelledError:
+            _warmed_hosts.discard(self.config.moodle_url)
+            raise
 
     async def __aenter__(self):
-        """Context manager entry"""
-        await self._init_browser()
+        """Context manager entry - הדפדפן מופעל רק כשמסלול ה-HTTP לא מספיק"""
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Context manager exit"""
-        await self._cleanup()
+        """Context manager exit - הדפדפן המשותף נשאר חם לאימותים הבאים"""
+        # החימום לא חי יותר מהמאמת - אחרת "Task was destroyed but it is pending"
+        if self._warmup_task is not None:
+            if not self._warmup_task.done():
+                self._warmup_task.cancel()
+            try:
+                await self._warmup_task
+            except asyncio.CancelledError:
+                pass
+            self._warmup_task = None
 
-    async def _init_browser(self) -> None:
-        """אתחול דפדפן עם תצורה מותאמת לעברית"""
-        try:
-            playwright = await async_playwright().start()
-            
-            # Launch browser with Hebrew support
-            self.browser = await playwright.chromium.launch(
-                headless=self.headless,
-                args=[
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-gpu',
-                    '--lang=he-IL',
-                    '--accept-lang=he-IL,he,en-US,en'
-                ]
-            )
-            
-            # Create context with Hebrew locale
-            self.context = await self.browser.new_context(
-                locale='he-IL',
-                timezone_id='Asia/Jerusalem',
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                viewport={'width': 1366, 'height': 768}
-            )
-            
-            # Create new page
-            self.page = await self.context.new_page()
-            
-            # Set default timeout
-            self.page.set_default_timeout(self.timeout)
-            
-            logger.info("🌐 Browser initialized with Hebrew support")
+    @classmethod
+    async def _init_browser(cls, headless: bool = True) -> BrowserPool:
+        """אתחול עצל של מאגר הדפדפן המשותף"""
+        loop = asyncio.get_running_loop()
+        if cls._pool is None or cls._pool_loop is not loop:
+            stale = cls._pool
+            cls._pool = BrowserPool(headless=headless)
+            cls._pool_loop = loop
             
-        except Exception as e:
-            logger.error(f"❌ Failed to initialize browser: {e}")
-            raise
-
-    async def _cleanup(self) -> None:
-        """ניקוי משאבי דפדפן"""
+            # מאגר מלולאה קודמת - סגירת Chromium וה-driver שלו במקום לזנוח אותם
+            if stale is not None:
+                try:
+                    await stale.close()
+                except Exception as e:
+                    logger.warning("⚠️ Error closing stale browser pool: %s", e)
+        
         try:
-            if self.page:
-                await self.page.close()
-            if self.context:
-                await self.context.close()
-            if self.browser:
-                await self.browser.close()
-                
-            logger.info("🧹 Browser cleanup completed")
-            
+            await cls._pool.start()
         except Exception as e:
-            logger.warning(f"⚠️ Error during cleanup: {e}")
+            logger.error("❌ Failed to initialize browser: %s", e)
+            raise
+        
+        return cls._pool
 
-    async def clear_session(self) -> None:
-        """ניקוי מוחלט של session וכל ה-cookies"""
+    @classmethod
+    async def shutdown(cls) -> None:
+        """שחרור המשאבים המשותפים (דפדפן וחיבורי HTTP) בסיום התהליך"""
         try:
-            if not self.context:
-                return
-                
-            # Clear all cookies
-            await self.context.clear_cookies()
-            
-            # Clear storage
-            await self.page.evaluate("""
-                () => {
-                    // Clear all storage
-                    if (window.localStorage) localStorage.clear();
-                    if (window.sessionStorage) sessionStorage.clear();
-                    
-                    // Clear any remaining cookies via document
-                    document.cookie.split(";").forEach(cookie => {
-                        const eqPos = cookie.indexOf("=");
-                        const name = eqPos > -1 ? cookie.substr(0, eqPos).trim() : cookie.trim();
-                        document.cookie = name + "=;expires=Thu, 01 Jan 1970 00:00:00 GMT;path=/;";
-                        document.cookie = name + "=;expires=Thu, 01 Jan 1970 00:00:00 GMT;path=/;domain=.bgu.ac.il;";
-                    });
-                }
-            """)
-            
-            logger.info("🧽 Session and cookies cleared completely")
-            
+            if cls._pool:
+                await cls._pool.close()
+                cls._pool = None
+            await close_connector()
         except Exception as e:
-            logger.warning(f"⚠️ Error clearing session: {e}")
+            logger.warning("⚠️ Error during cleanup: %s", e)
 
     async def validate_credentials(self, username: str, password: str) -> ValidationResult:
         """
@@ -227,28 +605,28 @@ class SmartMoodleValidator:
         start_time = time.time()
         
         try:
-            logger.info(f"🔐 Starting credential validation for user: {username}")
+            logger.info("🔐 Starting credential validation for user: %s", username)
             
-            # יצירת מופע דפדפן אם לא קיים
-            if not self.browser:
-                await self._init_browser()
+            cache_key = _result_cache_key(self.university, username, password)
+            result = _get_cached_result(cache_key)
             
-            # ניקוי session קיים
-            await self.clear_session()
-            
-            # ביצוע התחברות אמיתית
-            result = await self._perform_real_login(username, password)
+            if result:
+                logger.info("💾 Returning cached validation result")
+            else:
+                # ביצוע התחברות אמיתית
+                result = await self._perform_real_login(username, password)
+                _cache_result(cache_key, result)
             
             # חישוב זמן תגובה
             response_time = int((time.time() - start_time) * 1000)
             result.response_time_ms = response_time
             
-            logger.info(f"✅ Validation completed in {response_time}ms - Result: {result.result.value}")
+            logger.info("✅ Validation completed in %sms - Result: %s", response_time, result.result.value)
             return result
             
         except Exception as e:
             response_time = int((time.time() - start_time) * 1000)
-            logger.error(f"❌ Validation failed after {response_time}ms: {e}")
+            logger.error("❌ Validation failed after %sms: %s", response_time, e)
             
             return ValidationResult(
                 success=False,
@@ -263,12 +641,34 @@ class SmartMoodleValidator:
 
     async def _perform_real_login(self, username: str, password: str) -> ValidationResult:
         """ביצוע התחברות אמיתית למערכת מודל"""
+        # מסלול מהיר ביותר - שירות ה-token של מודל (בקשה אחת)
+        result = await self._token_login(username, password)
+        if result:
+            return result
+        
+        # מסלול מהיר - התחברות ב-HTTP ללא דפדפן
+        result = await self._http_login(username, password)
+        if result:
+            return result
+        
+        # השאלת context מהמאגר המשותף
+        pool = await self._init_browser(self.headless)
+        context = await pool.acquire()
+        
         try:
-            login_url = f"{self.config['moodle_url']}{self.config['login_path']}"
-            logger.info(f"🌐 Navigating to login page: {login_url}")
+            page = await context.new_page()
+        except Exception:
+            pool.release(context)
+            raise
+        
+        page.set_default_timeout(self.timeout)
+        
+        try:
+            login_url = self.config.login_url
+            logger.info("🌐 Navigating to login page: %s", login_url)
             
             # מעבר לעמוד ההתחברות
-            response = await self.page.goto(login_url, wait_until='domcontentloaded')
+            response = await page.goto(login_url, wait_until='domcontentloaded')
             
             if not response or not response.ok:
                 return ValidationResult(
@@ -281,12 +681,9 @@ class SmartMoodleValidator:
                     response_time_ms=0
                 )
             
-            # המתנה לטעינת הדף
-            await self.page.wait_for_load_state('networkidle', timeout=10000)
-            
             # בדיקה אם הדף במצב תחזוקה
-            page_content = await self.page.content()
-            if any(word in page_content.lower() for word in ['maintenance', 'תחזוקה', 'זמנית לא זמין']):
+            page_content = await page.content()
+            if self.config.maintenance_re.search(page_content):
                 return ValidationResult(
                     success=False,
                     result=AuthenticationResult.MAINTENANCE,
@@ -298,13 +695,13 @@ class SmartMoodleValidator:
                 )
             
             # מילוי טופס ההתחברות
-            await self._fill_login_form(username, password)
+            await self._fill_login_form(page, username, password)
             
             # בדיקת תוצאת ההתחברות
-            return await self._check_login_result(username)
+            return await self._check_login_result(page, username)
             
         except Exception as e:
-            logger.error(f"❌ Login process failed: {e}")
+            logger.error("❌ Login process failed: %s", e)
             
             if "timeout" in str(e).lower():
                 return ValidationResult(
@@ -319,49 +716,271 @@ class SmartMoodleValidator:
                 )
             
             raise
+        
+        finally:
+            # ה-context (והדף שבו) נסגר ומוחלף ב-context נקי למשתמש הבא
+            pool.release(context)
+
+    async def _token_login(self, username: str, password: str) -> Optional[ValidationResult]:
+        """
+        אימות דרך שירות ה-web service של מודל (login/token.php)
+        
+        Returns:
+            ValidationResult, או None כאשר השירות כבוי/לא זמין ויש לעבור למסלול החלופי
+        """
+        token_path = self.config.token_service_path
+        if not token_path or self.university in _token_service_unavailable:
+            return None
+        
+        token_url = f"{self.config.moodle_url}{token_path}"
+        
+        try:
+            async with aiohttp.ClientSession(
+                connector=get_connector(),
+                connector_owner=False,
+                headers=_HTTP_HEADERS
+            ) as session:
+                # POST ולא GET - שהסיסמה לא תופיע ב-URL ובלוגים
+                async with session.post(
+                    token_url,
+                    data={'username': username, 'password': password, 'service': 'moodle_mobile_app'},
+                    timeout=aiohttp.ClientTimeout(total=self.timeout / 1000)
+                ) as response:
+                    if response.status == 404:
+                        _token_service_unavailable.add(self.university)
+                        logger.info("🔄 Token service not found - using login form")
+                        return None
+                    if response.status >= 400:
+                        return None
+                    payload = await response.json(content_type=None)
+        
+        except ValueError:
+            # תשובה שאינה JSON - השירות לא קיים בפועל
+            _token_service_unavailable.add(self.university)
+            return None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.warning("⚠️ Token service request failed: %s", e)
+            return None
+        
+        if not isinstance(payload, dict):
+            _token_service_unavailable.add(self.university)
+            return None
+        
+        if payload.get('token'):
+            logger.info("✅ Login successful via token service")
+            return ValidationResult(
+                success=True,
+                result=AuthenticationResult.SUCCESS,
+                message_he="התחברות למערכת האוניברסיטה הצליחה",
+                message_en="Successfully authenticated with university system",
+                university=self.university,
+                username=username,
+                response_time_ms=0,
+                session_data={
+                    'url': token_url,
+                    'auth_method': 'token_service',
+                    'timestamp': int(time.time())
+                }
+            )
+        
+        known_error = _TOKEN_SERVICE_ERRORS.get(payload.get('errorcode'))
+        if known_error:
+            result, message_he, message_en = known_error
+            return ValidationResult(
+                success=False,
+                result=result,
+                message_he=message_he,
+                message_en=message_en,
+                university=self.university,
+                username=username,
+                response_time_ms=0,
+                error_details=payload.get('error')
+            )
+        
+        # השירות כבוי באתר (enablewsdescription, servicenotavailable וכו')
+        logger.info("🔄 Token service unavailable (%s) - using login form", payload.get('errorcode'))
+        _token_service_unavailable.add(self.university)
+        return None
+
+    async def _http_login(self, username: str, password: str) -> Optional[ValidationResult]:
+        """
+        התחברות מהירה ב-HTTP ישיר ללא דפדפן
+        
+        Returns:
+            ValidationResult, או None כאשר הדף דורש JS/CAPTCHA ויש לעבור לדפדפן
+        """
+        login_url = self.config.login_url
+        
+        try:
+            timeout = aiohttp.ClientTimeout(total=self.timeout / 1000)
+            async with aiohttp.ClientSession(
+                connector=get_connector(),
+                connector_owner=False,
+                headers=_HTTP_HEADERS
+            ) as session:
+                async with session.get(login_url, timeout=timeout) as response:
+                    if response.status >= 400:
+                        return ValidationResult(
+                            success=False,
+                            result=AuthenticationResult.NETWORK_ERROR,
+                            message_he="שגיאה בגישה למערכת האוניברסיטה",
+                            message_en="Failed to access university system",
+                            university=self.university,
+                            username=username,
+                            response_time_ms=0
+                        )
+                    html = await response.text()
+                    page_url = str(response.url)
+                
+                if self.config.maintenance_re.search(html):
+                    return ValidationResult(
+                        success=False,
+                        result=AuthenticationResult.MAINTENANCE,
+                        message_he="המערכת במצב תחזוקה כעת",
+                        message_en="System is under maintenance",
+                        university=self.university,
+                        username=username,
+                        response_time_ms=0
+                    )
+                
+                soup = await _parse_html(html, _LOGIN_FORM_STRAINER)
+                username_input = soup.select_one(self.config.username_field)
+                password_input = soup.select_one(self.config.password_field)
+                
+                # טופס שנבנה ב-JS או CAPTCHA - נדרש דפדפן מלא
+                if not username_input or not password_input or _CAPTCHA_RE.search(html):
+                    logger.info("🔄 Login form requires a browser - falling back to Playwright")
+                    return None
+                
+                form = password_input.find_parent('form')
+                action = urljoin(page_url, form.get('action') or '') if form else login_url
+                form_data = {
+                    field['name']: field.get('value', '')
+                    for field in (form.find_all('input', type='hidden') if form else [])
+                    if field.get('name')
+                }
+                form_data[username_input.get('name', 'username')] = username
+                form_data[password_input.get('name', 'password')] = password
+                
+                async with session.post(action, data=form_data, timeout=timeout) as response:
+                    html = await response.text()
+                    current_url = str(response.url)
+                
+                logger.info("🔍 Checking HTTP login result. Current URL: %s", current_url)
+                soup = await _parse_html(html)
+                
+                # בדיקה לשגיאות התחברות
+                for error_element in soup.select(self.config.error_selector):
+                    error_text = error_element.get_text(strip=True)
+                    if error_text:
+                        logger.warning("⚠️ Found error message: %s", error_text)
+                        return ValidationResult(
+                            success=False,
+                            result=AuthenticationResult.INVALID_CREDENTIALS,
+                            message_he=self._translate_error(error_text),
+                            message_en="Invalid username or password",
+                            university=self.university,
+                            username=username,
+                            response_time_ms=0
+                        )
+                
+                # בדיקה להתחברות מוצלחת
+                login_successful = (
+                    'login' not in current_url.lower()
+                    or soup.select_one(self.config.success_selector) is not None
+                    or self.config.dashboard_re.search(html) is not None
+                )
+                
+                if not login_successful:
+                    return ValidationResult(
+                        success=False,
+                        result=AuthenticationResult.INVALID_CREDENTIALS,
+                        message_he="שם משתמש או סיסמה שגויים",
+                        message_en="Invalid username or password",
+                        university=self.university,
+                        username=username,
+                        response_time_ms=0
+                    )
+                
+                logger.info("✅ Login successful via HTTP")
+                return ValidationResult(
+                    success=True,
+                    result=AuthenticationResult.SUCCESS,
+                    message_he="התחברות למערכת האוניברסיטה הצליחה",
+                    message_en="Successfully authenticated with university system",
+                    university=self.university,
+                    username=username,
+                    response_time_ms=0,
+                    session_data={
+                        'url': current_url,
+                        'title': soup.title.get_text(strip=True) if soup.title else '',
+                        'cookies_count': len(session.cookie_jar),
+                        'timestamp': int(time.time())
+                    }
+                )
+        
+        except asyncio.TimeoutError as e:
+            return ValidationResult(
+                success=False,
+                result=AuthenticationResult.TIMEOUT,
+                message_he="פג זמן החיבור למערכת האוניברסיטה",
+                message_en="Connection to university system timed out",
+                university=self.university,
+                username=username,
+                response_time_ms=0,
+                error_details=str(e)
+            )
+        except aiohttp.ClientError as e:
+            logger.error("❌ HTTP login failed: %s", e)
+            return ValidationResult(
+                success=False,
+                result=AuthenticationResult.NETWORK_ERROR,
+                message_he="שגיאה בגישה למערכת האוניברסיטה",
+                message_en="Failed to access university system",
+                university=self.university,
+                username=username,
+                response_time_ms=0,
+                error_details=str(e)
+            )
 
-    async def _fill_login_form(self, username: str, password: str) -> None:
+    async def _fill_login_form(self, page: Page, username: str, password: str) -> None:
         """מילוי טופס ההתחברות"""
         try:
-            selectors = self.config['login_form_selectors']
-            
             # המתנה לטעינת טופס ההתחברות
-            await self.page.wait_for_selector(selectors['username_field'], timeout=10000)
+            await page.wait_for_selector(self.config.username_field, timeout=10000)
             
             # מילוי שם משתמש
-            await self.page.fill(selectors['username_field'], username)
-            logger.info(f"📝 Username filled: {username}")
+            await page.fill(self.config.username_field, username)
+            logger.info("📝 Username filled: %s", username)
             
             # מילוי סיסמה
-            await self.page.fill(selectors['password_field'], password)
+            await page.fill(self.config.password_field, password)
             logger.info("🔑 Password filled")
             
-            # לחיצה על כפתור התחברות
-            await self.page.click(selectors['login_button'])
+            # לחיצה על כפתור התחברות והמתנה לעמוד התגובה (ללא המתנה לשקט ברשת)
+            async with page.expect_navigation(wait_until='domcontentloaded', timeout=15000):
+                await page.click(self.config.login_button)
             logger.info("👆 Login button clicked")
             
-            # המתנה לתגובת השרת
-            await self.page.wait_for_load_state('networkidle', timeout=15000)
-            
         except Exception as e:
-            logger.error(f"❌ Failed to fill login form: {e}")
+            logger.error("❌ Failed to fill login form: %s", e)
             raise
 
-    async def _check_login_result(self, username: str) -> ValidationResult:
+    async def _check_login_result(self, page: Page, username: str) -> ValidationResult:
         """בדיקת תוצאת ההתחברות"""
         try:
-            current_url = self.page.url
-            page_content = await self.page.content()
+            current_url = page.url
             
-            logger.info(f"🔍 Checking login result. Current URL: {current_url}")
+            logger.info("🔍 Checking login result. Current URL: %s", current_url)
             
-            # בדיקה לשגיאות התחברות
-            error_message = await self._check_for_errors()
-            if error_message:
+            # בדיקה לשגיאות התחברות ולאינדיקטורי הצלחה במקביל
+            indicator = await self._wait_for_indicator(page)
+            if indicator and indicator['kind'] == 'error':
+                logger.warning("⚠️ Found error message: %s", indicator['text'])
                 return ValidationResult(
                     success=False,
                     result=AuthenticationResult.INVALID_CREDENTIALS,
-                    message_he=error_message,
+                    message_he=self._translate_error(indicator['text']),
                     message_en="Invalid username or password",
                     university=self.university,
                     username=username,
@@ -369,7 +988,6 @@ class SmartMoodleValidator:
                 )
             
             # בדיקה להתחברות מוצלחת
-            success_indicators = self.config['success_indicators']
             login_successful = False
             
             # בדיקת URL - אם לא נשארנו בעמוד ההתחברות
@@ -378,27 +996,20 @@ class SmartMoodleValidator:
                 logger.info("✅ Login successful - URL changed from login page")
             
             # בדיקת אינדיקטורים בתוכן הדף
+            elif indicator:
+                login_successful = True
+                logger.info("✅ Login successful - Found success indicator: %s", indicator['selector'])
+            
+            # בדיקת טקסט הדף להוכחות נוספות (טקסט בלבד, ללא סריאליזציה של כל ה-DOM)
             if not login_successful:
-                for indicator in success_indicators:
-                    try:
-                        element = await self.page.wait_for_selector(indicator, timeout=3000)
-                        if element:
-                            login_successful = True
-                            logger.info(f"✅ Login successful - Found success indicator: {indicator}")
-                            break
-                    except:
-                        continue
-            
-            # בדיקת תוכן הדף להוכחות נוספות
-            if not login_successful:
-                dashboard_keywords = ['dashboard', 'my courses', 'הקורסים שלי', 'לוח המחוונים']
-                if any(keyword in page_content.lower() for keyword in dashboard_keywords):
+                page_text = await page.locator('body').inner_text()
+                if self.config.dashboard_re.search(page_text):
                     login_successful = True
                     logger.info("✅ Login successful - Found dashboard keywords")
             
             if login_successful:
                 # איסוף מידע נוסף על ה-session
-                session_data = await self._extract_session_data()
+                session_data = await self._extract_session_data(page)
                 
                 return ValidationResult(
                     success=True,
@@ -422,7 +1033,7 @@ class SmartMoodleValidator:
                 )
                 
         except Exception as e:
-            logger.error(f"❌ Error checking login result: {e}")
+            logger.error("❌ Error checking login result: %s", e)
             return ValidationResult(
                 success=False,
                 result=AuthenticationResult.UNKNOWN_ERROR,
@@ -434,79 +1045,67 @@ class SmartMoodleValidator:
                 error_details=str(e)
             )
 
-    async def _check_for_errors(self) -> Optional[str]:
-        """בדיקה לשגיאות התחברות"""
+    async def _wait_for_indicator(self, page: Page, timeout: int = 5000) -> Optional[Dict[str, str]]:
+        """
+        המתנה לאינדיקטור השגיאה או ההצלחה הראשון שמופיע בדף
+        
+        Returns:
+            dict עם kind ('error'/'success'), selector ו-text (לשגיאות), או None אם לא נמצא דבר
+        """
         try:
-            error_selectors = self.config['error_selectors']
-            
-            for selector in error_selectors:
-                try:
-                    error_element = await self.page.wait_for_selector(selector, timeout=2000)
-                    if error_element:
-                        error_text = await error_element.text_content()
-                        if error_text and error_text.strip():
-                            logger.warning(f"⚠️ Found error message: {error_text}")
-                            
-                            # תרגום שגיאות נפוצות לעברית
-                            if 'invalid' in error_text.lower() or 'incorrect' in error_text.lower():
-                                return "שם משתמש או סיסמה אינם נכונים"
-                            elif 'locked' in error_text.lower() or 'suspended' in error_text.lower():
-                                return "החשבון נחסם או מושעה"
-                            elif 'captcha' in error_text.lower():
-                                return "נדרש אימות קפצ'ה"
-                            else:
-                                return error_text.strip()
-                except:
-                    continue
+            handle = await page.wait_for_function(
+                _INDICATOR_RACE_JS,
+                arg={
+                    'errorSelector': self.config.error_selector,
+                    'successSelector': self.config.success_selector
+                },
+                timeout=timeout
+            )
+            return await handle.json_value()
             
+        except PlaywrightTimeoutError:
             return None
-            
         except Exception as e:
-            logger.warning(f"⚠️ Error checking for login errors: {e}")
+            logger.warning("⚠️ Error checking for login indicators: %s", e)
             return None
 
-    async def _extract_session_data(self) -> Dict[str, Any]:
+    @staticmethod
+    def _translate_error(error_text: str) -> str:
+        """תרגום שגיאות נפוצות לעברית"""
+        error_lower = error_text.lower()
+        if 'invalid' in error_lower or 'incorrect' in error_lower:
+            return "שם משתמש או סיסמה אינם נכונים"
+        elif 'locked' in error_lower or 'suspended' in error_lower:
+            return "החשבון נחסם או מושעה"
+        elif 'captcha' in error_lower:
+            return "נדרש אימות קפצ'ה"
+        else:
+            return error_text.strip()
+
+    async def _extract_session_data(self, page: Page) -> Dict[str, Any]:
         """חילוץ מידע על ה-session לאחר התחברות מוצלחת"""
         try:
             session_data = {
-                'url': self.page.url,
-                'title': await self.page.title(),
-                'cookies_count': len(await self.context.cookies()),
+                'url': page.url,
+                'title': await page.title(),
+                'cookies_count': len(await page.context.cookies()),
                 'timestamp': int(time.time())
             }
             
             # ניסיון לחילוץ שם המשתמש מהדף
             try:
-                user_info = await self.page.evaluate("""
-                    () => {
-                        // חיפוש שם משתמש באלמנטים שונים
-                        const userSelectors = [
-                            '.username', '.user-name', '.user-info', 
-                            '[data-username]', '#user-menu', '.user-menu',
-                            '.navbar-text', '.user-profile'
-                        ];
-                        
-                        for (const selector of userSelectors) {
-                            const element = document.querySelector(selector);
-                            if (element && element.textContent.trim()) {
-                                return element.textContent.trim();
-                            }
-                        }
-                        
-                        return null;
-                    }
-                """)
+                user_info = await page.evaluate(_USER_INFO_JS)
                 
                 if user_info:
                     session_data['user_display_name'] = user_info
                     
             except Exception as e:
-                logger.warning(f"⚠️ Could not extract user info: {e}")
+                logger.warning("⚠️ Could not extract user info: %s", e)
             
             return session_data
             
         except Exception as e:
-            logger.warning(f"⚠️ Error extracting session data: {e}")
+            logger.warning("⚠️ Error extracting session data: %s", e)
             return {'timestamp': int(time.time())}
 
 # Convenience functions for API usage
@@ -526,28 +1125,39 @@ async def validate_bgu_credentials(username: str, password: str, headless: bool
     async with SmartMoodleValidator('bgu', headless=headless) as validator:
         return await validator.validate_credentials(username, password)
 
-async def test_credentials_batch(credentials_list: List[Tuple[str, str]], university: str = 'bgu') -> List[ValidationResult]:
+async def test_credentials_batch(
+    credentials_list: List[Tuple[str, str]],
+    university: str = 'bgu',
+    concurrency: int = BROWSER_POOL_SIZE,
+    requests_per_second: Optional[float] = None
+) -> List[ValidationResult]:
     """
     בדיקת אצווה של פרטי התחברות
     
     Args:
         credentials_list: רשימת טיפלים של (שם משתמש, סיסמה)
         university: מזהה האוניברסיטה
+        concurrency: מספר אימותים מקבילים (לא יותר מגודל מאגר הדפדפן)
+        requests_per_second: תקרת קצב משותפת להתחלת אימותים מול השרת (None - ללא הגבלה)
         
     Returns:
-        רשימת ValidationResult
+        רשימת ValidationResult (באותו סדר כמו הקלט)
     """
-    results = []
+    semaphore = asyncio.Semaphore(concurrency)
     
-    async with SmartMoodleValidator(university, headless=True) as validator:
-        for username, password in credentials_list:
-            result = await validator.validate_credentials(username, password)
-            results.append(result)
-            
-            # המתנה קצרה בין בדיקות למניעת חסימה
-            await asyncio.sleep(1)
+    # הגבלת קצב אופציונלית למניעת חסימה - משותפת לכל האצוות שרצות במקביל
+    rate_limiter = _get_batch_rate_limiter(requests_per_second) if requests_per_second else None
     
-    return results
+    async with SmartMoodleValidator(university, headless=True) as validator:
+        async def validate_one(username: str, password: str) -> ValidationResult:
+            async with semaphore:
+                if rate_limiter:
+                    await rate_limiter.acquire()
+                return await validator.validate_credentials(username, password)
+        
+        return list(await asyncio.gather(
+            *(validate_one(username, password) for username, password in credentials_list)
+        ))
 
 # Example usage and testing
 if __name__ == "__main__":
@@ -574,6 +1184,8 @@ if __name__ == "__main__":
         
         if result.error_details:
             print(f"   Error Details: {result.error_details}")
+        
+        await SmartMoodleValidator.shutdown()
     
     # Run the test
     asyncio.run(main())
\ No newline at end of file
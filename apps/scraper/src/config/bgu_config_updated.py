@@ -4,47 +4,102 @@
 מבוססת על בדיקת הדף החדש: https://moodle.bgu.ac.il/moodle/local/mydashboard/
 """
 
+import asyncio
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+# הודעות הדיבאג של ההתחברות כבויות כברירת מחדל - ניתן להפעיל עם setLevel(logging.DEBUG)
+logger.setLevel(logging.WARNING)
+
+# סוגי משאבים שהמאמת לא צריך - הוא נוגע רק בשדות הטופס ובכפתור
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'media', 'stylesheet'})
+
+# בקשות שעוברות את סינון הסוג (סקריפטים/XHR/beacons) ואינן נחוצות להתחברות
+_DENY_RE = re.compile(r"analytics|piwik|matomo|sentry|pluginfile\.php|theme/image\.php|favicon\.ico")
+
+async def block_unneeded_resources(route) -> None:
+    """חסימת תמונות, פונטים, מדיה, CSS ונקודות ניטור/אנליטיקה בזמן ההתחברות"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or _DENY_RE.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+# סקריפטים שרצים בדף - איתור, בדיקת נראות ופעולה בקריאה אחת לדפדפן במקום כמה
+_IS_VISIBLE_JS = "el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)"
+_IS_USABLE_JS = f"el => !el.disabled && ({_IS_VISIBLE_JS})(el)"
+
+_FILL_FIELD_JS = f"""
+    (elements, value) => {{
+        const isUsable = {_IS_USABLE_JS};
+        const element = elements.find(isUsable);
+        if (!element) return false;
+        element.focus();
+        element.value = value;
+        element.dispatchEvent(new Event('input', {{ bubbles: true }}));
+        element.dispatchEvent(new Event('change', {{ bubbles: true }}));
+        return element.value === value;
+    }}
+"""
+
+_FIND_USABLE_INDEX_JS = f"""
+    elements => elements.findIndex({_IS_USABLE_JS})
+"""
+
+_VISIBLE_TEXTS_JS = f"""
+    selector => Array.from(document.querySelectorAll(selector))
+        .filter({_IS_VISIBLE_JS})
+        .map(el => el.textContent.trim())
+        .filter(Boolean)
+"""
+
 class BGUConfig:
     """תצורה מעודכנת לבן גוריון עם Fallback URLs"""
     
     # URLs למעבר (בסדר עדיפות)
-    URLS = [
+    URLS = (
         "https://moodle.bgu.ac.il/moodle/local/mydashboard/",  # URL חדש עובד
         "https://moodle.bgu.ac.il/moodle/login/index.php",    # Fallback ישן
         "https://moodle.bgu.ac.il/login/index.php",          # Fallback נוסף
         "https://moodle.bgu.ac.il/moodle/",                  # Fallback כללי
         "https://moodle.bgu.ac.il/"                         # Fallback מינימלי
-    ]
+    )
     
     # סלקטורים שנמצאו בבדיקה האמיתית
     LOGIN_SELECTORS = {
-        'username_field': [
+        'username_field': (
             '#login_username',              # נמצא בבדיקה - primary
             'input[name="username"]',       # fallback standard
             '#username',                    # fallback common
             'input[placeholder*="שם משתמש"]' # fallback Hebrew
-        ],
-        'password_field': [
+        ),
+        'password_field': (
             '#login_password',              # נמצא בבדיקה - primary  
             'input[name="password"]',       # fallback standard
             '#password',                    # fallback common
             'input[type="password"]'        # fallback generic
-        ],
-        'login_button': [
+        ),
+        'login_button': (
             'input[type="submit"]',         # נמצא בבדיקה - primary
             'button[type="submit"]',        # fallback button
             'form button',                  # fallback form button
             '.btn-primary',                 # fallback CSS class
             '#loginbtn'                     # fallback ID
-        ],
-        'login_token': [
+        ),
+        'login_token': (
             'input[name="logintoken"]',     # נמצא בבדיקה - hidden field
             'input[type="hidden"][name*="token"]'  # fallback pattern
-        ]
+        )
     }
     
+    # סלקטור CSS יחיד (OR) לכל רשימת fallback - מחושב פעם אחת בהגדרת המחלקה
+    USERNAME_JOINED = ', '.join(LOGIN_SELECTORS['username_field'])
+    PASSWORD_JOINED = ', '.join(LOGIN_SELECTORS['password_field'])
+    BUTTON_JOINED = ', '.join(LOGIN_SELECTORS['login_button'])
+    
     # אינדיקטורים להצלחה
-    SUCCESS_INDICATORS = [
+    SUCCESS_INDICATORS = (
         '/my/',                             # Moodle standard dashboard
         '/local/mydashboard/',              # BGU specific dashboard  
         '/dashboard/',                      # General dashboard
@@ -52,10 +107,14 @@ class BGUConfig:
         '/user/profile.php',                # User profile
         'moodle.bgu.ac.il/my',             # Full URL pattern
         'moodle.bgu.ac.il/local'           # Full URL pattern
-    ]
+    )
+    
+    # בדיקת URL בביטוי מהודר אחד במקום לולאה על האינדיקטורים
+    SUCCESS_URL_RE = re.compile('|'.join(map(re.escape, SUCCESS_INDICATORS)))
+    LOGIN_URL_RE = re.compile('login', re.IGNORECASE)
     
     # אינדיקטורים לשגיאות
-    ERROR_SELECTORS = [
+    ERROR_SELECTORS = (
         '.alert-danger',                    # Bootstrap error
         '.error',                          # Generic error class
         '#loginerrormessage',              # Moodle specific
@@ -65,10 +124,11 @@ class BGUConfig:
         '.errormessage',                   # Another common pattern
         '.loginerrors',                    # Moodle pattern
         '.alert.alert-danger'              # Combined Bootstrap class
-    ]
+    )
+    ERROR_JOINED = ', '.join(ERROR_SELECTORS)
     
     # טקסטים העוצים על שגיאות (עברית ואנגלית)
-    ERROR_TEXT_PATTERNS = [
+    ERROR_TEXT_PATTERNS = (
         'invalid',
         'incorrect', 
         'שגוי',
@@ -77,7 +137,10 @@ class BGUConfig:
         'אינו נכון',
         'כישלון',
         'נכשל'
-    ]
+    )
+    
+    # כל הדפוסים בביטוי אחד מהודר - סריקה יחידה, ללא lower() על הטקסט
+    ERROR_TEXT_RE = re.compile('|'.join(map(re.escape, ERROR_TEXT_PATTERNS)), re.IGNORECASE)
     
     # הגדרות timeout
     TIMEOUTS = {
@@ -97,62 +160,130 @@ class BGUConfig:
         'viewport': {'width': 1366, 'height': 768},
         'args': [
             '--no-sandbox',
-            '--disable-dev-shm-usage', 
-            '--disable-gpu',
+            '--disable-dev-shm-usage',     # /dev/shm קטן בקונטיינרים
+            '--disable-blink-features=AutomationControlled',
+            '--disable-background-networking',
+            '--disable-background-timer-throttling',
+            '--disable-renderer-backgrounding',
+            '--disable-features=IsolateOrigins,site-per-process,TranslateUI',
+            '--disable-sync',
+            '--metrics-recording-only',
+            '--no-first-run',
             '--lang=he-IL',
             '--accept-lang=he-IL,he,en-US,en'
         ]
     }
 
+def html_has_login_form(html: str) -> bool:
+    """
+    בדיקת קיום טופס התחברות על HTML גולמי - ללא דפדפן (לבדיקות ו-fixtures)
+    
+    בניגוד ל-_check_login_form_exists, אין כאן בדיקת נראות - רק קיום שדה סיסמה.
+    """
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html, 'lxml')
+    return soup.select_one(BGUConfig.PASSWORD_JOINED) is not None
+
+def find_login_error_in_html(html: str) -> str:
+    """חיפוש הודעת שגיאת התחברות ב-HTML גולמי - המקבילה של _check_for_errors ללא דפדפן"""
+    from bs4 import BeautifulSoup
+    
+    soup = BeautifulSoup(html, 'lxml')
+    for element in soup.select(BGUConfig.ERROR_JOINED):
+        text = element.get_text(strip=True)
+        if text and BGUConfig.ERROR_TEXT_RE.search(text):
+            return text
+    
+    return None
+
 class BGUAuthenticator:
-    """מחלקה לאימות בן גוריון עם fallback URLs"""
+    """
+    מחלקה לאימות בן גוריון עם fallback URLs
+    
+    fast_mode: שליש מכל timeout ורק שני ה-URLs הראשונים. מסלול הכישלון מתקצר
+    פי כמה, במחיר false negatives כשהשרת איטי או כשרק URL fallback מאוחר עובד.
+    """
     
     def __init__(self, fast_mode: bool = False):
         self.config = BGUConfig()
         self.fast_mode = fast_mode
         
-    async def try_multiple_urls(self, page, username: str, password: str) -> dict:
-        """ניסיון התחברות עם מספר URLs"""
+        self._timeouts = dict(self.config.TIMEOUTS)
+        self._urls = self.config.URLS
+        if fast_mode:
+            self._timeouts = {key: value // 3 for key, value in self.config.TIMEOUTS.items()}
+            self._urls = self.config.URLS[:2]
         
-        for i, url in enumerate(self.config.URLS):
-            try:
-                print(f"🌐 מנסה URL {i+1}/{len(self.config.URLS)}: {url}")
-                
-                # ניווט לURL
-                response = await page.goto(
-                    url, 
-                    wait_until="networkidle", 
-                    timeout=self.config.TIMEOUTS['page_load']
-                )
-                
-                if not response or response.status >= 400:
-                    print(f"❌ HTTP {response.status if response else 'No response'} - עובר לURL הבא")
-                    continue
-                
-                # בדוק אם יש שדות התחברות
-                has_login_form = await self._check_login_form_exists(page)
-                
-                if not has_login_form:
-                    print(f"⚠️ לא נמצא טופס התחברות ב-{url} - עובר לURL הבא")
-                    continue
-                
-                print(f"✅ נמצא טופס התחברות ב-{url}")
+    async def try_multiple_urls(self, page, username: str, password: str, nav_fn=None) -> dict:
+        """
+        ניסיון התחברות עם מספר URLs
+        
+        כל ה-URLs נבדקים במקביל - הדף הראשון הוא של הקורא, ולשאר נפתח context
+        נפרד מאותו דפדפן (cookies של Moodle משותפים ב-context, ו-logintoken של
+        טופס אחד לא תקף מול session של טופס אחר). ההתחברות מתבצעת בטופס
+        הראשון שנטען, והשאר מבוטלים ונסגרים.
+        
+        Args:
+            nav_fn: פונקציית ניווט חלופית (page, url, **kwargs) - ברירת מחדל page.goto.
+                    בבדיקות אפשר להחליף ב-page.set_content עם HTML מקומי.
+        """
+        
+        urls = self._urls
+        browser = page.context.browser
+        extra_contexts = []
+        tasks = {}
+        
+        try:
+            for i, url in enumerate(urls):
+                probe_page = page
+                if i > 0:
+                    probe_context = await _new_login_context(browser, self.config.BROWSER_CONFIG)
+                    extra_contexts.append(probe_context)
+                    probe_page = await probe_context.new_page()
                 
-                # ניסיון התחברות
-                login_result = await self._attempt_login(page, username, password)
+                logger.debug("🌐 מנסה URL %d/%d: %s", i + 1, len(urls), url)
+                tasks[asyncio.create_task(self._probe_url(probe_page, url, nav_fn))] = (url, probe_page)
+            
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
                 
-                if login_result['success']:
-                    login_result['successful_url'] = url
-                    return login_result
-                else:
-                    print(f"❌ התחברות נכשלה ב-{url}: {login_result.get('error', 'Unknown error')}")
+                for task in done:
+                    url, probe_page = tasks[task]
+                    
+                    if task.exception():
+                        logger.debug("❌ שגיאה עם %s: %s", url, task.exception())
+                        continue
+                    
+                    if not task.result():
+                        continue
+                    
+                    logger.debug("✅ נמצא טופס התחברות ב-%s", url)
+                    
+                    # ניסיון התחברות
+                    login_result = await self._attempt_login(probe_page, username, password)
+                    
+                    if login_result['success']:
+                        login_result['successful_url'] = url
+                        return login_result
+                    
+                    logger.debug("❌ התחברות נכשלה ב-%s: %s", url, login_result.get('error', 'Unknown error'))
                     # אם זו שגיאת credentials, לא כדאי לנסות URLs נוספים
                     if login_result.get('error_type') == 'INVALID_CREDENTIALS':
                         return login_result
-                    
-            except Exception as e:
-                print(f"❌ שגיאה עם {url}: {str(e)}")
-                continue
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            
+            from playwright.async_api import Error as PlaywrightError
+            
+            for probe_context in extra_contexts:
+                try:
+                    await probe_context.close()
+                except PlaywrightError:
+                    pass
         
         # אם הגענו לכאן, כל ה-URLs נכשלו
         return {
@@ -160,31 +291,65 @@ class BGUAuthenticator:
             'error': 'NETWORK_ERROR',
             'message_he': 'לא הצלחתי להתחבר לאף אחד מה-URLs של בן גוריון',
             'message_en': 'Failed to connect to any BGU URLs',
-            'tested_urls': self.config.URLS
+            'tested_urls': list(self._urls)
         }
     
+    async def _probe_url(self, page, url: str, nav_fn=None) -> bool:
+        """ניווט ל-URL ובדיקה אם נטען בו טופס התחברות"""
+        
+        if nav_fn is None:
+            response = await page.goto(
+                url, 
+                wait_until="domcontentloaded", 
+                timeout=self._timeouts['page_load']
+            )
+        else:
+            response = await nav_fn(
+                page,
+                url,
+                wait_until="domcontentloaded",
+                timeout=self._timeouts['page_load']
+            )
+        
+        # תוכן מוזרק (set_content) לא מחזיר response - שם מכריעה בדיקת הטופס
+        if response is not None and response.status >= 400:
+            logger.debug("❌ HTTP %s ב-%s", response.status, url)
+            return False
+        
+        # בדוק אם יש שדות התחברות
+        if not await self._check_login_form_exists(page):
+            logger.debug("⚠️ לא נמצא טופס התחברות ב-%s", url)
+            return False
+        
+        return True
+    
     async def _check_login_form_exists(self, page) -> bool:
         """בדיקה אם קיים טופס התחברות בדף"""
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
         
-        # בדוק אם יש שדה סיסמה (הסימן הכי ברור לטופס התחברות)
-        for selector in self.config.LOGIN_SELECTORS['password_field']:
-            try:
-                element = await page.query_selector(selector)
-                if element and await element.is_visible():
-                    return True
-            except:
-                continue
-        
-        return False
+        # המתנה לשדה סיסמה (הסימן הכי ברור לטופס התחברות) - טופס שעדיין
+        # מרונדר לא נפסל מיד והדף לא עובר ל-URL הבא לשווא
+        try:
+            await page.locator(self.config.PASSWORD_JOINED).first.wait_for(
+                state='visible',
+                timeout=self._timeouts['element_wait']
+            )
+            return True
+        except PlaywrightTimeoutError:
+            return False
     
     async def _attempt_login(self, page, username: str, password: str) -> dict:
         """ניסיון התחברות עם טיפול בשגיאות"""
         
+        # locators נבנים פעם אחת לדף ומשמשים למילוי, לבדיקה וללחיצה
+        username_field = page.locator(self.config.USERNAME_JOINED)
+        password_field = page.locator(self.config.PASSWORD_JOINED)
+        login_button = page.locator(self.config.BUTTON_JOINED)
+        
         try:
             # מילוי שדה משתמש
             username_filled = await self._fill_field(
-                page, 
-                self.config.LOGIN_SELECTORS['username_field'], 
+                username_field,
                 username,
                 'username'
             )
@@ -200,8 +365,7 @@ class BGUAuthenticator:
             
             # מילוי שדה סיסמה
             password_filled = await self._fill_field(
-                page,
-                self.config.LOGIN_SELECTORS['password_field'],
+                password_field,
                 password,
                 'password'
             )
@@ -215,8 +379,8 @@ class BGUAuthenticator:
                     'message_en': 'Failed to fill password field'
                 }
             
-            # לחיצה על כפתור התחברות
-            login_clicked = await self._click_login_button(page)
+            # לחיצה על כפתור התחברות והמתנה לתגובת השרת
+            login_clicked = await self._click_login_button(page, login_button, password_field)
             
             if not login_clicked:
                 return {
@@ -227,12 +391,6 @@ class BGUAuthenticator:
                     'message_en': 'Failed to click login button'
                 }
             
-            # המתנה לתגובת השרת
-            await page.wait_for_load_state(
-                'networkidle', 
-                timeout=self.config.TIMEOUTS['form_submit']
-            )
-            
             # בדיקת תוצאת ההתחברות
             return await self._check_authentication_result(page, username)
             
@@ -246,64 +404,113 @@ class BGUAuthenticator:
                 'exception': str(e)
             }
     
-    async def _fill_field(self, page, selectors: list, value: str, field_name: str) -> bool:
-        """מילוי שדה עם selectors מרובים"""
+    async def _wait_for_login_outcome(self, page, timeout: int) -> None:
+        """המתנה לסימן הראשון לתוצאת ההתחברות (במקום המתנה לשקט ברשת)"""
+        
+        waiters = [
+            asyncio.ensure_future(page.wait_for_url(
+                self.config.SUCCESS_URL_RE,
+                wait_until='domcontentloaded',
+                timeout=timeout
+            )),
+            asyncio.ensure_future(page.wait_for_selector(
+                self.config.ERROR_JOINED,
+                timeout=timeout
+            ))
+        ]
+        
+        try:
+            pending = set(waiters)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if any(not task.exception() for task in done):
+                    break
+        finally:
+            for task in waiters:
+                task.cancel()
+            # איסוף חריגות (timeout/ביטול) של הממתינים שהפסידו
+            await asyncio.gather(*waiters, return_exceptions=True)
+    
+    async def _fill_field(self, field, value: str, field_name: str) -> bool:
+        """מילוי שדה לפי locator של הסלקטור המאוחד של כל ה-fallbacks"""
+        
+        # מסלול מהיר - בדיקת נראות ומילוי בקריאה אחת על כל המועמדים
+        try:
+            if await field.evaluate_all(_FILL_FIELD_JS, value):
+                logger.debug("✅ מולא שדה %s עם selector: %s", field_name, field)
+                return True
+        except Exception as e:
+            logger.debug("⚠️ מילוי מהיר של שדה %s נכשל: %s", field_name, e)
         
-        for selector in selectors:
+        # fallback - מילוי דרך Playwright
+        try:
+            elements = await field.element_handles()
+        except Exception as e:
+            logger.debug("⚠️ שגיאה עם selector %s: %s", field, e)
+            elements = []
+        
+        for element in elements:
             try:
-                element = await page.query_selector(selector)
-                if element and await element.is_visible() and await element.is_enabled():
+                if await element.is_visible() and await element.is_enabled():
                     await element.fill(value)
-                    print(f"✅ מולא שדה {field_name} עם selector: {selector}")
-                    
-                    # וודא שהערך נשמר
-                    if field_name != 'password':  # לא בודקים סיסמה מסיבות אבטחה
-                        current_value = await element.input_value()
-                        if current_value == value:
-                            return True
-                    else:
-                        return True  # מניחים שהסיסמה מולאה בהצלחה
+                    logger.debug("✅ מולא שדה %s עם selector: %s", field_name, field)
+                    # fill() כבר ממתין שהערך ייקבע - אין צורך בקריאה חוזרת של input_value
+                    return True
                         
             except Exception as e:
-                print(f"⚠️ שגיאה עם selector {selector}: {str(e)}")
+                logger.debug("⚠️ שגיאה במילוי שדה %s: %s", field_name, e)
                 continue
         
-        print(f"❌ לא הצלחתי למלא שדה {field_name}")
+        logger.debug("❌ לא הצלחתי למלא שדה %s", field_name)
         return False
     
-    async def _click_login_button(self, page) -> bool:
+    async def _click_login_button(self, page, login_button, password_field) -> bool:
         """לחיצה על כפתור התחברות"""
         
-        for selector in self.config.LOGIN_SELECTORS['login_button']:
-            try:
-                element = await page.query_selector(selector)
-                if element and await element.is_visible() and await element.is_enabled():
-                    await element.click()
-                    print(f"✅ נלחץ כפתור התחברות עם selector: {selector}")
-                    return True
-            except Exception as e:
-                print(f"⚠️ שגיאה עם selector {selector}: {str(e)}")
-                continue
+        try:
+            # איתור הכפתור הנראה והפעיל הראשון בקריאה אחת
+            index = await login_button.evaluate_all(_FIND_USABLE_INDEX_JS)
+            if index >= 0:
+                await self._submit_and_wait(page, login_button.nth(index).click)
+                logger.debug("✅ נלחץ כפתור התחברות עם selector: %s", login_button)
+                return True
+        except Exception as e:
+            logger.debug("⚠️ שגיאה בלחיצה על כפתור התחברות: %s", e)
         
         # ניסיון fallback עם Enter
         try:
-            print("🔄 מנסה להגיש טופס עם Enter...")
-            for selector in self.config.LOGIN_SELECTORS['password_field']:
-                element = await page.query_selector(selector)
-                if element:
-                    await element.press('Enter')
-                    print("✅ הוגש טופס עם Enter")
-                    return True
+            logger.debug("🔄 מנסה להגיש טופס עם Enter...")
+            if await password_field.count():
+                await self._submit_and_wait(page, lambda: password_field.first.press('Enter'))
+                logger.debug("✅ הוגש טופס עם Enter")
+                return True
         except Exception as e:
-            print(f"❌ גם Enter נכשל: {str(e)}")
+            logger.debug("❌ גם Enter נכשל: %s", e)
         
         return False
     
+    async def _submit_and_wait(self, page, submit) -> None:
+        """
+        הגשת הטופס כשההמתנה לניווט רשומה לפני הלחיצה - אין מרוץ בין הלחיצה לניווט
+        
+        אם ההגשה לא מנווטת (התחברות בתוך הדף), ממתינים לאינדיקטור הצלחה/שגיאה.
+        """
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+        
+        try:
+            async with page.expect_navigation(
+                wait_until='domcontentloaded',
+                timeout=self._timeouts['form_submit']
+            ):
+                await submit()
+        except PlaywrightTimeoutError:
+            await self._wait_for_login_outcome(page, self._timeouts['element_wait'])
+    
     async def _check_authentication_result(self, page, username: str) -> dict:
         """בדיקת תוצאת ההתחברות"""
         
         current_url = page.url
-        print(f"📍 URL אחרי התחברות: {current_url}")
+        logger.debug("📍 URL אחרי התחברות: %s", current_url)
         
         # בדיקת שגיאות קודם
         error_message = await self._check_for_errors(page)
@@ -318,13 +525,8 @@ class BGUAuthenticator:
             }
         
         # בדיקת הצלחה לפי URL
-        url_success = any(
-            indicator in current_url 
-            for indicator in self.config.SUCCESS_INDICATORS
-        )
-        
-        if url_success:
-            print("✅ התחברות הצליחה - זוהה לפי URL")
+        if self.config.SUCCESS_URL_RE.search(current_url):
+            logger.debug("✅ התחברות הצליחה - זוהה לפי URL")
             return {
                 'success': True,
                 'message_he': 'התחברות למערכת בן גוריון הצליחה',
@@ -334,8 +536,8 @@ class BGUAuthenticator:
             }
         
         # בדיקה נוספת - אם עזבנו את דף ההתחברות זה סימן טוב
-        if 'login' not in current_url.lower():
-            print("✅ התחברות הצליחה - עזבנו את דף ההתחברות")
+        if not self.config.LOGIN_URL_RE.search(current_url):
+            logger.debug("✅ התחברות הצליחה - עזבנו את דף ההתחברות")
             return {
                 'success': True,
                 'message_he': 'התחברות למערכת בן גוריון הצליחה',
@@ -356,23 +558,103 @@ class BGUAuthenticator:
     
     async def _check_for_errors(self, page) -> str:
         """בדיקת הודעות שגיאה בדף"""
+        from playwright.async_api import Error as PlaywrightError
         
-        for selector in self.config.ERROR_SELECTORS:
-            try:
-                element = await page.query_selector(selector)
-                if element and await element.is_visible():
-                    text = await element.text_content()
-                    if text and text.strip():
-                        # בדוק אם זה באמת שגיאת התחברות
-                        text_lower = text.lower()
-                        if any(pattern in text_lower for pattern in self.config.ERROR_TEXT_PATTERNS):
-                            print(f"❌ נמצאה שגיאת התחברות: {text}")
-                            return text.strip()
-            except:
-                continue
+        # טקסטים של כל הודעות השגיאה הנראות - בקריאה אחת
+        # (שגיאות Playwright בלבד - ביטול המשימה חייב לעבור הלאה)
+        try:
+            texts = await page.evaluate(_VISIBLE_TEXTS_JS, self.config.ERROR_JOINED)
+        except PlaywrightError:
+            return None
+        
+        for text in texts:
+            # בדוק אם זה באמת שגיאת התחברות
+            if self.config.ERROR_TEXT_RE.search(text):
+                logger.debug("❌ נמצאה שגיאת התחברות: %s", text)
+                return text
         
         return None
 
+class _BrowserPool:
+    """דפדפנים משותפים בין קריאות - אחד לכל תצורת הפעלה, במקום הפעלת Chromium בכל אימות"""
+    
+    def __init__(self):
+        self._playwright = None
+        self._browsers = {}
+        self._loop = None
+        self._lock = None
+    
+    async def get(self, headless: bool, slow_mo: int, args: list):
+        """החזרת דפדפן פעיל לתצורה הנתונה (הפעלה עצלה)"""
+        from playwright.async_api import async_playwright
+        
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # דפדפנים קשורים ל-event loop שבו הופעלו - הישנים נסגרים לפני האיפוס,
+            # אחרת כל asyncio.run() משאיר Chromium יתום (ה-signal handlers כבויים)
+            if self._loop is not None:
+                try:
+                    await self.shutdown()
+                except Exception as e:
+                    logger.warning("⚠️ שגיאה בסגירת דפדפנים מלולאה קודמת: %s", e)
+            self._playwright = None
+            self._browsers = {}
+            self._loop = loop
+            self._lock = asyncio.Lock()
+        
+        key = (headless, slow_mo, tuple(args))
+        async with self._lock:
+            browser = self._browsers.get(key)
+            if browser and browser.is_connected():
+                return browser
+            
+            if not self._playwright:
+                self._playwright = await async_playwright().start()
+            
+            browser = await self._playwright.chromium.launch(
+                headless=headless,
+                slow_mo=slow_mo,
+                args=args,
+                chromium_sandbox=False,
+                # הסגירה מנוהלת ב-shutdown_browsers, לא ע"י signal handlers
+                handle_sigint=False,
+                handle_sigterm=False
+            )
+            self._browsers[key] = browser
+            return browser
+    
+    async def shutdown(self) -> None:
+        """סגירת כל הדפדפנים המשותפים"""
+        browsers, self._browsers = self._browsers, {}
+        playwright, self._playwright = self._playwright, None
+        
+        try:
+            for browser in browsers.values():
+                try:
+                    await browser.close()
+                except Exception as e:
+                    logger.warning("⚠️ שגיאה בסגירת דפדפן: %s", e)
+        finally:
+            if playwright:
+                await playwright.stop()
+
+_browser_pool = _BrowserPool()
+
+async def _new_login_context(browser, browser_config: dict):
+    """context נקי להתחברות, עם חסימת משאבים כבדים"""
+    context = await browser.new_context(
+        locale=browser_config['locale'],
+        timezone_id=browser_config['timezone'], 
+        user_agent=browser_config['user_agent'],
+        viewport=browser_config['viewport']
+    )
+    await context.route('**/*', block_unneeded_resources)
+    return context
+
+async def shutdown_browsers() -> None:
+    """סגירת הדפדפנים המשותפים בסיום התהליך"""
+    await _browser_pool.shutdown()
+
 # Convenience function for easy usage
 async def authenticate_bgu_with_fallback(username: str, password: str, fast_mode: bool = False) -> dict:
     """
@@ -386,39 +668,29 @@ async def authenticate_bgu_with_fallback(username: str, password: str, fast_mode
     Returns:
         dict עם תוצאת האימות
     """
-    from playwright.async_api import async_playwright
-    
     authenticator = BGUAuthenticator(fast_mode=fast_mode)
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(
-            headless=authenticator.config.BROWSER_CONFIG['headless'],
-            slow_mo=authenticator.config.BROWSER_CONFIG['slow_mo'],
-            args=authenticator.config.BROWSER_CONFIG['args']
-        )
-        
-        context = await browser.new_context(
-            locale=authenticator.config.BROWSER_CONFIG['locale'],
-            timezone_id=authenticator.config.BROWSER_CONFIG['timezone'], 
-            user_agent=authenticator.config.BROWSER_CONFIG['user_agent'],
-            viewport=authenticator.config.BROWSER_CONFIG['viewport']
-        )
-        
+    browser = await _browser_pool.get(
+        headless=authenticator.config.BROWSER_CONFIG['headless'],
+        slow_mo=authenticator.config.BROWSER_CONFIG['slow_mo'],
+        args=authenticator.config.BROWSER_CONFIG['args']
+    )
+    
+    # context חדש לכל קריאה - בידוד cookies בין משתמשים
+    context = await _new_login_context(browser, authenticator.config.BROWSER_CONFIG)
+    
+    try:
         page = await context.new_page()
-        
-        try:
-            result = await authenticator.try_multiple_urls(page, username, password)
-            return result
-        finally:
-            await browser.close()
+        return await authenticator.try_multiple_urls(page, username, password)
+    finally:
+        await context.close()
 
 if __name__ == "__main__":
     # Test example (don't run with real credentials in production)
-    import asyncio
-    
     async def test():
         result = await authenticate_bgu_with_fallback("test_user", "test_pass", fast_mode=True)
         print(f"Result: {result}")
+        await shutdown_browsers()
     
     # asyncio.run(test())  # Uncomment to test
-    print("✅ BGU Config loaded successfully")
\ No newline at end of file
+    print("✅ BGU Config loaded successfully")
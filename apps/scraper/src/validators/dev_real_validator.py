@@ -7,11 +7,113 @@ import asyncio
 import json
 import sys
 from playwright.async_api import async_playwright
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 import argparse
+import logging
+import os
+import re
 import time
+from datetime import datetime
 
-print("🚨 DEBUG: קובץ dev_real_validator.py רץ עכשיו!")
-print(f"🚨 DEBUG: נתיב קובץ: {__file__}")
+try:
+    import orjson
+except ImportError:
+    # fallback ל-json הסטנדרטי אם orjson לא מותקן
+    orjson = None
+
+# לוגים ל-stderr בלבד - stdout שמור לתוצאת ה-JSON שנקראת ע"י Node.js
+logger = logging.getLogger(__name__)
+
+logger.debug("🚨 DEBUG: קובץ dev_real_validator.py רץ עכשיו!")
+logger.debug("🚨 DEBUG: נתיב קובץ: %s", __file__)
+
+# URL שעדיין בתהליך ההתחברות
+_LOGIN_URL_RE = re.compile('login', re.IGNORECASE)
+
+# ניסיונות ניווט לדף ההתחברות לפני כישלון האימות
+_GOTO_ATTEMPTS = 3
+
+# משאבים שטופס ההתחברות לא צריך, ומארחי analytics של צד שלישי
+# (לא stylesheet - בלי CSS כפתורים מוסתרים מקבלים גודל ונחשבים גלויים)
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font'})
+_ANALYTICS_RE = re.compile(r"google-analytics|googletagmanager|doubleclick|hotjar|piwik|matomo|sentry")
+
+async def _block_unneeded_resources(route) -> None:
+    """חסימת בקשות כבדות/מיותרות ברמת ה-context"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or _ANALYTICS_RE.search(request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+# הסלקטור הראשון (לפי סדר העדיפות) שמוצא אלמנט נראה ופעיל, או -1
+_FIRST_USABLE_JS = """
+    selectors => {
+        const isUsable = el => !el.disabled
+            && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+        for (let i = 0; i < selectors.length; i++) {
+            const element = document.querySelector(selectors[i]);
+            if (element && isUsable(element)) return i;
+        }
+        return -1;
+    }
+"""
+
+# אלמנטים שמופיעים רק אחרי התחברות מוצלחת, וכותרות h1 של לוח הבקרה
+SUCCESS_ELEMENTS = (
+    '.dashboard', '.profile', '.user-info',
+    '[class*="dashboard"]', '[class*="profile"]'
+)
+SUCCESS_HEADINGS = ('לוח בקרה', 'Dashboard')
+
+# סלקטור טקסט של Playwright (text="...") - document.querySelector לא מכיר אותו
+_TEXT_SELECTOR_RE = re.compile(r'^text="(.*)"$')
+
+# סיווג תוצאת ההתחברות בקריאה אחת: אלמנט הצלחה, והודעת השגיאה הראשונה (לפי סדר הסלקטורים)
+_LOGIN_OUTCOME_JS = """
+    ({ successSelectors, headings, checkSuccess, errorSelectors, errorTexts }) => {
+        const success = checkSuccess && (
+            successSelectors.some(selector => !!document.querySelector(selector))
+            || Array.from(document.querySelectorAll('h1'))
+                .some(h1 => headings.some(text => h1.textContent.includes(text)))
+        );
+        
+        let error = null;
+        for (const selector of errorSelectors) {
+            const element = document.querySelector(selector);
+            const text = element && element.textContent.trim();
+            if (text) { error = text; break; }
+        }
+        if (error === null && errorTexts.length && document.body) {
+            const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT);
+            for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+                const text = node.textContent.trim();
+                if (errorTexts.includes(text)) { error = text; break; }
+            }
+        }
+        
+        return { success, error };
+    }
+"""
+
+# מילוי השדה הנגיש הראשון (לפי סדר העדיפות) - מחזיר את אינדקס הסלקטור, או -1
+_FILL_FIRST_USABLE_JS = """
+    ({ selectors, value }) => {
+        const isUsable = el => !el.disabled
+            && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+        for (let i = 0; i < selectors.length; i++) {
+            const element = document.querySelector(selectors[i]);
+            if (!element || !isUsable(element)) continue;
+            element.focus();
+            element.value = value;
+            element.dispatchEvent(new Event('input', { bubbles: true }));
+            element.dispatchEvent(new Event('change', { bubbles: true }));
+            return element.value === value ? i : -1;
+        }
+        return -1;
+    }
+"""
 
 class DevMoodleValidator:
     """
@@ -57,19 +159,103 @@ class DevMoodleValidator:
                 }
             }
         }
+        
+        # רשימות סלקטורים (בסדר עדיפות, ללא כפילויות) וסלקטור מאוחד לכל שדה - מחושבים פעם אחת
+        self._selectors = {}
+        self._joined = {}
+        for university, config in self.configs.items():
+            alternatives = config.get('alternative_selectors', {})
+            self._selectors[university] = {
+                field: list(dict.fromkeys([config[field]] + alternatives.get(field, [])))
+                for field in ('username_field', 'password_field', 'login_button')
+            }
+            self._joined[university] = {
+                field: ', '.join(selectors)
+                for field, selectors in self._selectors[university].items()
+            }
+        
+        # כל אינדיקטורי ה-URL של הצלחה בביטוי מהודר אחד - סריקה יחידה של ה-URL
+        self._success_re = {
+            university: re.compile('|'.join(map(re.escape, config['success_indicators'])))
+            for university, config in self.configs.items()
+        }
+        
+        # סלקטורי שגיאה של האוניברסיטה + בדיקות כלליות, ללא כפילויות (.login-error הופיע פעמיים)
+        # מפוצלים לסלקטורי CSS ולטקסטים מדויקים (text="...") עבור סקריפט הסיווג
+        self._error_probes = {}
+        for university, config in self.configs.items():
+            selectors = list(dict.fromkeys(config.get('error_indicators', []) + [
+                '[class*="error"]', '[class*="alert"]', '.login-error',
+                'text="Invalid"', 'text="שגוי"', 'text="כישלון"'
+            ]))
+            texts = [m.group(1) for m in map(_TEXT_SELECTOR_RE.match, selectors) if m]
+            self._error_probes[university] = {
+                'errorSelectors': [sel for sel in selectors if not _TEXT_SELECTOR_RE.match(sel)],
+                'errorTexts': texts
+            }
+        
+        # דפדפן חם שמשותף בין אימותים - context חדש לכל אימות
+        self._pw = None
+        self._browser = None
+        self._browser_lock = asyncio.Lock()
+    
+    async def _ensure_browser(self):
+        """הפעלה עצלה של Playwright והדפדפן בקריאה הראשונה, ושימוש חוזר בהמשך"""
+        async with self._browser_lock:
+            if self._browser and self._browser.is_connected():
+                return self._browser
+            
+            if not self._pw:
+                self._pw = await async_playwright().start()
+            
+            # Chromium משותף לכמה workers (הופעל עם --remote-debugging-port) - מתחברים במקום להפעיל
+            cdp_url = os.getenv('PLAYWRIGHT_CDP_URL')
+            if cdp_url:
+                logger.debug("🔌 מתחבר לדפדפן משותף: %s", cdp_url)
+                self._browser = await self._pw.chromium.connect_over_cdp(cdp_url)
+                return self._browser
+            
+            # ללא slow_mo - fast_mode משפיע רק על ה-timeouts
+            self._browser = await self._pw.chromium.launch(
+                headless=True,
+                args=[
+                    '--no-sandbox',
+                    '--disable-dev-shm-usage',
+                    '--disable-gpu',
+                    '--disable-extensions',
+                    '--no-first-run',
+                    '--disable-background-timer-throttling',
+                    '--disable-renderer-backgrounding',
+                    '--disable-backgrounding-occluded-windows'
+                ]
+            )
+            return self._browser
     
-    async def validate(self, university: str, username: str, password: str, fast_mode: bool = False) -> dict:
+    async def aclose(self) -> None:
+        """סגירת הדפדפן (או ניתוק מדפדפן משותף) ו-Playwright בסיום התהליך"""
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+        
+        if self._pw:
+            await self._pw.stop()
+            self._pw = None
+    
+    async def validate(self, university: str, username: str, password: str, fast_mode: bool = False,
+                       session_state: dict = None, return_session_state: bool = False) -> dict:
         """
         ביצוע אימות אמיתי - לא סימולציה!
+        
+        session_state: storage state מאימות קודם - אם ה-session עדיין בתוקף, מדלגים על ההתחברות
+        return_session_state: החזרת ה-storage state של אימות מוצלח ב-session_data (מכיל cookies!)
         """
-        from datetime import datetime
-        print("🚨 DEBUG: הסקרייפר החדש רץ!")
-        print(f"🚨 DEBUG: URL שאני משתמש בו: https://moodle.bgu.ac.il/moodle/local/mydashboard/")
-        print(f"🚨 DEBUG: תאריך הקובץ: {datetime.now()}")
-        print("🚨 DEBUG: קובץ זה רץ עכשיו!")
-        print(f"🚨 DEBUG: נתיב קובץ: {__file__}")
-        print(f"🚨 DEBUG: פונקציית validate נקראת עם university={university}")
-        print(f"🚨 DEBUG: URL שאני משתמש בו: {self.configs.get(university, {}).get('login_url', 'לא נמצא')}")
+        logger.debug("🚨 DEBUG: הסקרייפר החדש רץ!")
+        logger.debug("🚨 DEBUG: URL שאני משתמש בו: https://moodle.bgu.ac.il/moodle/local/mydashboard/")
+        logger.debug("🚨 DEBUG: תאריך הקובץ: %s", datetime.now())
+        logger.debug("🚨 DEBUG: קובץ זה רץ עכשיו!")
+        logger.debug("🚨 DEBUG: נתיב קובץ: %s", __file__)
+        logger.debug("🚨 DEBUG: פונקציית validate נקראת עם university=%s", university)
+        logger.debug("🚨 DEBUG: URL שאני משתמש בו: %s", self.configs.get(university, {}).get('login_url', 'לא נמצא'))
         
         start_time = time.time()
         
@@ -82,203 +268,248 @@ class DevMoodleValidator:
         
         config = self.configs[university]
         
-        async with async_playwright() as p:
-            # הפעלת דפדפן (מופטם לmfast-mode)
-            browser = await p.chromium.launch(
-                headless=True,
-                slow_mo=50 if not fast_mode else 0,  # מהיר יותר ב-fast mode
-                args=[
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-gpu',
-                    '--no-first-run',
-                    '--disable-background-timer-throttling',
-                    '--disable-renderer-backgrounding',
-                    '--disable-backgrounding-occluded-windows'
-                ] if fast_mode else []
+        # context חדש מתחיל ללא cookies - אין צורך ב-clear_cookies (אלא אם הועבר session_state)
+        browser = await self._ensure_browser()
+        context = await browser.new_context(
+            locale='he-IL',
+            timezone_id='Asia/Jerusalem',
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            storage_state=session_state
+        )
+        
+        try:
+            await context.route('**/*', _block_unneeded_resources)
+            page = await context.new_page()
+            
+            # ניווט לעמוד התחברות (מותאם למצב מהיר)
+            timeout = 10000 if fast_mode else 15000
+            await self._open_login_page(page, config, timeout, expect_session=bool(session_state))
+            
+            # session שמור ועדיין בתוקף - Moodle לא הפנה לדף ההתחברות
+            if session_state and not _LOGIN_URL_RE.search(page.url):
+                logger.debug("♻️ session קיים בתוקף עבור %s - מדלג על מילוי הטופס", username)
+            else:
+                await self._submit_login(page, university, config, username, password, timeout)
+            
+            current_url = page.url
+            logger.debug("📍 URL אחרי התחברות: %s", current_url)
+            
+            # בדיקת הצלחה מעמיקה יותר
+            logger.debug("🔍 מנתח את התגובה...")
+            
+            # בדוק אם נשארנו באותו URL (אינדיקטור לכישלון)
+            if current_url == config['login_url']:
+                logger.debug("⚠️ נשארנו בדף ההתחברות - כנראה כישלון")
+            elif _LOGIN_URL_RE.search(current_url):
+                logger.debug("⚠️ עדיין ב-URL שמכיל 'login' - כנראה כישלון")
+            else:
+                logger.debug("✅ עברנו מדף ההתחברות - סימן טוב!")
+            
+            # בדיקת אינדיקטורים מרובים
+            logger.debug("🎯 בודק אינדיקטורי הצלחה: %s", config['success_indicators'])
+            url_success = bool(self._success_re[university].search(current_url))
+            logger.debug("📊 תוצאת בדיקת URL: %s", url_success)
+            
+            # אלמנטי הצלחה (רק אם ה-URL לא הכריע) ושגיאות מפורשות - בקריאה אחת לדפדפן
+            outcome = await page.evaluate(_LOGIN_OUTCOME_JS, {
+                'successSelectors': SUCCESS_ELEMENTS,
+                'headings': SUCCESS_HEADINGS,
+                'checkSuccess': not url_success,
+                **self._error_probes[university]
+            })
+            element_success = outcome['success']
+            has_login_error = outcome['error'] is not None
+            logger.debug("📊 תוצאת בדיקת אלמנטים: %s", element_success)
+            if has_login_error:
+                logger.debug("❌ נמצאה שגיאת התחברות: %s", outcome['error'])
+            
+            is_success = (url_success or element_success) and not has_login_error
+            response_time_ms = int((time.time() - start_time) * 1000)
+            
+            logger.debug(
+                "🎯 תוצאת בדיקה: URL=%s, Elements=%s, HasError=%s, Final=%s",
+                url_success, element_success, has_login_error, is_success
             )
             
-            try:
-                context = await browser.new_context(
-                    locale='he-IL',
-                    timezone_id='Asia/Jerusalem',
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                )
-                
-                page = await context.new_page()
-                
-                # ניקוי session - וודא שזה אימות אמיתי
-                await context.clear_cookies()
-                print(f"🧹 ניקוי session עבור {username}")
-                
-                # ניווט לעמוד התחברות (מותאם למצב מהיר)
-                timeout = 10000 if fast_mode else 15000
-                print(f"🌐 ניווט ל-{config['login_url']} (fast-mode: {fast_mode})")
-                await page.goto(config['login_url'])
-                await page.wait_for_load_state('networkidle', timeout=timeout)
-                
-                # בדוק מה קרה אחרי הניווט
-                current_url = page.url
-                page_title = await page.title()
-                print(f"📍 URL אחרי ניווט: {current_url}")
-                print(f"📄 כותרת הדף: {page_title}")
-                
-                # בדוק אם יש שדות התחברות בדף
-                username_field = await page.query_selector("#login_username")
-                password_field = await page.query_selector("#login_password")
-                submit_button = await page.query_selector("input[type='submit']")
-                
-                print(f"🔍 בדיקת שדות בדף:")
-                print(f"  - שדה משתמש: {'✅' if username_field else '❌'}")
-                print(f"  - שדה סיסמה: {'✅' if password_field else '❌'}")
-                print(f"  - כפתור שליחה: {'✅' if submit_button else '❌'}")
-                
-                # מילוי פרטי התחברות עם נסיונות מרובים
-                print(f"✍️ מזין שם משתמש: {username}")
-                print(f"🔍 מחפש שדה משתמש עם סלקטור: {config['username_field']}")
-                username_filled = await self._try_fill_field(page, config, 'username_field', username)
-                
-                print("🔒 מזין סיסמה")
-                print(f"🔍 מחפש שדה סיסמה עם סלקטור: {config['password_field']}")
-                password_filled = await self._try_fill_field(page, config, 'password_field', password)
-                
-                if not username_filled or not password_filled:
-                    raise Exception("לא הצלחתי למלא את פרטי ההתחברות - אולי הדף השתנה")
-                
-                # התחברות עם נסיונות מרובים
-                print("🚀 לוחץ על התחבר")
-                login_clicked = await self._try_click_button(page, config, 'login_button')
-                
-                if not login_clicked:
-                    raise Exception("לא הצלחתי למצוא את כפתור ההתחברות")
-                
-                # המתן לתגובה (מהיר יותר ב-fast mode)
-                print("⏳ מחכה לתגובה מהשרת...")
-                await page.wait_for_load_state('networkidle', timeout=timeout)
+            if is_success:
+                logger.debug("✅ התחברות הצליחה!")
+                user_data = await self._extract_basic_user_data(page)
                 
-                current_url = page.url
-                print(f"📍 URL אחרי התחברות: {current_url}")
-                
-                # בדיקת הצלחה מעמיקה יותר
-                print(f"🔍 מנתח את התגובה...")
-                
-                # בדוק אם נשארנו באותו URL (אינדיקטור לכישלון)
-                if current_url == config['login_url']:
-                    print("⚠️ נשארנו בדף ההתחברות - כנראה כישלון")
-                elif 'login' in current_url.lower():
-                    print("⚠️ עדיין ב-URL שמכיל 'login' - כנראה כישלון")
-                else:
-                    print("✅ עברנו מדף ההתחברות - סימן טוב!")
-                
-                # בדיקת אינדיקטורים מרובים
-                print(f"🎯 בודק אינדיקטורי הצלחה: {config['success_indicators']}")
-                url_success = any(indicator in current_url for indicator in config['success_indicators'])
-                print(f"📊 תוצאת בדיקת URL: {url_success}")
-                
-                # בדיקות נוספות לוודא הצלחה
-                page_title = await page.title()
-                page_content = await page.content()
-                
-                print(f"📄 כותרת הדף: {page_title}")
-                
-                # בדיקת אלמנטים מציינים הצלחה
-                success_elements = [
-                    '.dashboard', '.profile', '.user-info', 
-                    '[class*="dashboard"]', '[class*="profile"]',
-                    'h1:has-text("לוח בקרה")', 'h1:has-text("Dashboard")'
-                ]
-                
-                element_success = False
-                for selector in success_elements:
-                    try:
-                        element = await page.query_selector(selector)
-                        if element:
-                            element_success = True
-                            print(f"✅ נמצא אלמנט מצליח: {selector}")
-                            break
-                    except:
-                        continue
-                
-                # בדיקת שגיאות מפורשות
-                has_login_error = False
-                error_selectors = config.get('error_indicators', []) + [
-                    '[class*="error"]', '[class*="alert"]', '.login-error',
-                    'text="Invalid"', 'text="שגוי"', 'text="כישלון"'
-                ]
-                
-                for selector in error_selectors:
-                    try:
-                        element = await page.query_selector(selector)
-                        if element:
-                            error_text = await element.text_content()
-                            if error_text and error_text.strip():
-                                has_login_error = True
-                                print(f"❌ נמצאה שגיאת התחברות: {error_text}")
-                                break
-                    except:
-                        continue
-                
-                is_success = (url_success or element_success) and not has_login_error
-                response_time_ms = int((time.time() - start_time) * 1000)
-                
-                print(f"🎯 תוצאת בדיקה: URL={url_success}, Elements={element_success}, HasError={has_login_error}, Final={is_success}")
-                
-                if is_success:
-                    print("✅ התחברות הצליחה!")
-                    user_data = await self._extract_basic_user_data(page)
-                    
-                    return {
-                        'success': True,
-                        'result': 'success',
-                        'message_he': 'התחברות למודל בוצעה בהצלחה',
-                        'message_en': 'Moodle authentication successful',
-                        'university': university,
-                        'username': username,
-                        'response_time_ms': response_time_ms,
-                        'user_data': user_data,
-                        'session_data': {
-                            'validated_url': current_url,
-                            'timestamp': int(time.time())
-                        }
-                    }
-                else:
-                    print("❌ התחברות נכשלה")
-                    error_msg = await self._get_error_message(page, config)
-                    
-                    return {
-                        'success': False,
-                        'result': 'invalid_credentials',
-                        'error': 'INVALID_CREDENTIALS',
-                        'message_he': error_msg or 'שם משתמש או סיסמה שגויים',
-                        'message_en': 'Invalid username or password',
-                        'university': university,
-                        'username': username,
-                        'response_time_ms': response_time_ms,
-                        'error_details': {
-                            'current_url': current_url,
-                            'error_message': error_msg
-                        }
+                result = {
+                    'success': True,
+                    'result': 'success',
+                    'message_he': 'התחברות למודל בוצעה בהצלחה',
+                    'message_en': 'Moodle authentication successful',
+                    'university': university,
+                    'username': username,
+                    'response_time_ms': response_time_ms,
+                    'user_data': user_data,
+                    'session_data': {
+                        'validated_url': current_url,
+                        'timestamp': int(time.time())
                     }
-                    
-            except Exception as e:
-                print(f"💥 שגיאה: {str(e)}")
-                response_time_ms = int((time.time() - start_time) * 1000)
+                }
+                if return_session_state:
+                    result['session_data']['storage_state'] = await context.storage_state()
+                return result
+            else:
+                logger.debug("❌ התחברות נכשלה")
+                error_msg = await self._get_error_message(page, config)
+                
                 return {
                     'success': False,
-                    'result': 'validation_error',
-                    'error': 'VALIDATION_ERROR',
-                    'message_he': f'שגיאה באימות: {str(e)}',
-                    'message_en': f'Validation error: {str(e)}',
+                    'result': 'invalid_credentials',
+                    'error': 'INVALID_CREDENTIALS',
+                    'message_he': error_msg or 'שם משתמש או סיסמה שגויים',
+                    'message_en': 'Invalid username or password',
                     'university': university,
                     'username': username,
                     'response_time_ms': response_time_ms,
                     'error_details': {
-                        'exception': str(e),
-                        'type': type(e).__name__
+                        'current_url': current_url,
+                        'error_message': error_msg
                     }
                 }
-            finally:
-                await browser.close()
+                
+        except Exception as e:
+            logger.debug("💥 שגיאה: %s", e)
+            response_time_ms = int((time.time() - start_time) * 1000)
+            return {
+                'success': False,
+                'result': 'validation_error',
+                'error': 'VALIDATION_ERROR',
+                'message_he': f'שגיאה באימות: {str(e)}',
+                'message_en': f'Validation error: {str(e)}',
+                'university': university,
+                'username': username,
+                'response_time_ms': response_time_ms,
+                'error_details': {
+                    'exception': str(e),
+                    'type': type(e).__name__
+                }
+            }
+        finally:
+            await context.close()
+    
+    async def _open_login_page(self, page, config, timeout: int, expect_session: bool = False) -> None:
+        """ניווט לדף ההתחברות עם ניסיונות חוזרים באותו context (backoff אקספוננציאלי)"""
+        for attempt in range(_GOTO_ATTEMPTS):
+            try:
+                logger.debug("🌐 ניווט ל-%s (ניסיון %d)", config['login_url'], attempt + 1)
+                await page.goto(config['login_url'], wait_until='domcontentloaded', timeout=timeout)
+                break
+            except PlaywrightError as e:
+                if attempt == _GOTO_ATTEMPTS - 1:
+                    raise
+                logger.debug("⚠️ ניווט נכשל (%s) - מנסה שוב", e)
+                await asyncio.sleep(0.2 * 2 ** attempt)
+        
+        # עם session שמור ייתכן שכבר אין טופס - אין טעם לחכות לו
+        if expect_session and not _LOGIN_URL_RE.search(page.url):
+            return
+        
+        # המתנה לשדה המשתמש במקום לשקט ברשת (analytics/keepalive לא נגמרים)
+        try:
+            await page.wait_for_selector(config['username_field'], state='visible', timeout=timeout)
+        except PlaywrightTimeoutError:
+            logger.debug("⚠️ %s לא הופיע - ממשיך לסלקטורים החלופיים", config['username_field'])
+    
+    async def _submit_login(self, page, university: str, config, username: str, password: str, timeout: int) -> None:
+        """מילוי הטופס, שליחה והמתנה לתגובת השרת"""
+        # בדוק מה קרה אחרי הניווט
+        current_url = page.url
+        logger.debug("📍 URL אחרי ניווט: %s", current_url)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📄 כותרת הדף: %s", await page.title())
+        
+        # בדוק אם יש שדות התחברות בדף (לדיבאג בלבד - לא שווה round-trips אחרת)
+        if logger.isEnabledFor(logging.DEBUG):
+            username_field = await page.query_selector("#login_username")
+            password_field = await page.query_selector("#login_password")
+            submit_button = await page.query_selector("input[type='submit']")
+            
+            logger.debug("🔍 בדיקת שדות בדף:")
+            logger.debug("  - שדה משתמש: %s", '✅' if username_field else '❌')
+            logger.debug("  - שדה סיסמה: %s", '✅' if password_field else '❌')
+            logger.debug("  - כפתור שליחה: %s", '✅' if submit_button else '❌')
+        
+        # מילוי פרטי התחברות עם נסיונות מרובים
+        # שני השדות בלתי תלויים - המילוי רץ במקביל וה-round-trips חופפים
+        logger.debug("✍️ מזין שם משתמש: %s", username)
+        logger.debug("🔍 מחפש שדה משתמש עם סלקטור: %s", config['username_field'])
+        logger.debug("🔒 מזין סיסמה")
+        logger.debug("🔍 מחפש שדה סיסמה עם סלקטור: %s", config['password_field'])
+        username_filled, password_filled = await asyncio.gather(
+            self._try_fill_field(page, university, 'username_field', username),
+            self._try_fill_field(page, university, 'password_field', password)
+        )
+        
+        if not username_filled or not password_filled:
+            raise Exception("לא הצלחתי למלא את פרטי ההתחברות - אולי הדף השתנה")
+        
+        # הגשה ב-Enter על שדה הסיסמה - הדפדפן מגיש את הטופס בעצמו, בלי חיפוש כפתור
+        if not await self._submit_with_enter(page, university, timeout):
+            # התחברות עם נסיונות מרובים
+            # ההמתנה לניווט נרשמת לפני הלחיצה, כמו ב-Enter - אחרת בדיקת התוצאה
+            # רצה על הדף הישן (ה-login_url של BGU לא מכיל 'login')
+            logger.debug("🚀 לוחץ על התחבר")
+            login_clicked = False
+            try:
+                async with page.expect_navigation(wait_until='commit', timeout=timeout):
+                    login_clicked = await self._try_click_button(page, university, 'login_button')
+                    if not login_clicked:
+                        raise Exception("לא הצלחתי למצוא את כפתור ההתחברות")
+            except PlaywrightError as e:
+                if not login_clicked:
+                    raise
+                logger.debug("⚠️ הלחיצה לא הובילה לניווט (%s) - ממשיך לבדיקת התוצאה", e)
+        
+        # המתן לתגובה (מהיר יותר ב-fast mode)
+        logger.debug("⏳ מחכה לתגובה מהשרת...")
+        await self._wait_for_login_outcome(page, config, timeout)
+    
+    async def _submit_with_enter(self, page, university: str, timeout: int) -> bool:
+        """
+        הקשת Enter בשדה הסיסמה כשההמתנה לניווט רשומה מראש
+        
+        מחכים ל-commit (תחילת תגובת השרת) לאורך כל ה-timeout ולא לחלון קצר: לחיצה
+        על הכפתור בזמן שההגשה עדיין בדרך הייתה שולחת את הטופס פעמיים.
+        """
+        try:
+            async with page.expect_navigation(wait_until='commit', timeout=timeout):
+                await page.locator(self._joined[university]['password_field']).first.press('Enter')
+            logger.debug("✅ הטופס הוגש באמצעות Enter")
+            return True
+        except PlaywrightError as e:
+            logger.debug("⚠️ Enter לא הוביל לניווט (%s) - עובר ללחיצה על הכפתור", e)
+            return False
+    
+    async def _wait_for_login_outcome(self, page, config, timeout: int) -> None:
+        """המתנה ליציאה מדף ההתחברות או להודעת שגיאה - המוקדם מביניהם"""
+        waiters = [
+            asyncio.ensure_future(page.wait_for_url(
+                lambda url: not _LOGIN_URL_RE.search(url),
+                wait_until='domcontentloaded',
+                timeout=timeout
+            )),
+            asyncio.ensure_future(page.wait_for_selector(
+                ', '.join(config['error_indicators']),
+                timeout=timeout
+            ))
+        ]
+        
+        try:
+            pending = set(waiters)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if any(not task.exception() for task in done):
+                    break
+            else:
+                logger.debug("⚠️ לא זוהתה תגובה מהשרת בזמן - ממשיך לבדיקת התוצאה")
+        finally:
+            for task in waiters:
+                task.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
     
     async def _extract_basic_user_data(self, page) -> dict:
         """חילוץ נתוני משתמש בסיסיים"""
@@ -306,101 +537,96 @@ class DevMoodleValidator:
         except:
             return {}
     
-    async def _try_fill_field(self, page, config, field_key: str, value: str) -> bool:
-        """נסיון מילוי שדה עם selector חלופיים - מעודכן עם לוגים מפורטים"""
-        print(f"🔍 מנסה למלא שדה: {field_key}")
-        
-        selectors = [config[field_key]]  # הסלקטור הבסיסי
+    async def _first_usable(self, page, selectors: list):
+        """אינדקס הסלקטור הראשון שמוצא אלמנט נראה ופעיל - בקריאה אחת לדפדפן"""
+        index = await page.evaluate(_FIRST_USABLE_JS, selectors)
+        return index if index >= 0 else None
+    
+    async def _find_usable(self, page, university: str, field_key: str):
+        """
+        הסלקטור הנגיש הראשון לשדה - ואם אין עדיין, המתנה קצרה (auto-wait) לאחד
+        מהם דרך הסלקטור המאוחד ובדיקה חוזרת
+        """
+        selectors = self._selectors[university][field_key]
+        index = await self._first_usable(page, selectors)
+        if index is None:
+            try:
+                await page.locator(self._joined[university][field_key]).first.wait_for(
+                    state='visible', timeout=5000
+                )
+            except PlaywrightTimeoutError:
+                return None
+            index = await self._first_usable(page, selectors)
         
-        # הוספת סלקטורים חלופיים אם קיימים
-        if 'alternative_selectors' in config and field_key in config['alternative_selectors']:
-            selectors.extend(config['alternative_selectors'][field_key])
+        return selectors[index] if index is not None else None
+    
+    async def _try_fill_field(self, page, university: str, field_key: str, value: str) -> bool:
+        """נסיון מילוי שדה עם selector חלופיים - מעודכן עם לוגים מפורטים"""
+        logger.debug("🔍 מנסה למלא שדה: %s", field_key)
+        selectors = self._selectors[university][field_key]
+        logger.debug("🎯 סלקטורים לבדיקה עבור %s: %s", field_key, selectors)
         
-        print(f"🎯 סלקטורים לבדיקה עבור {field_key}: {selectors}")
+        # מסלול מהיר - איתור, מילוי ואירועי input/change בקריאה אחת לדפדפן
+        try:
+            index = await page.evaluate(_FILL_FIRST_USABLE_JS, {'selectors': selectors, 'value': value})
+            if index >= 0:
+                logger.debug("    ✅ מולא שדה %s בהצלחה עם סלקטור: %s", field_key, selectors[index])
+                return True
+        except Exception as e:
+            logger.debug("    ⚠️ מילוי מהיר של שדה %s נכשל: %s", field_key, e)
         
-        for i, selector in enumerate(selectors):
-            try:
-                print(f"  🔍 בודק סלקטור {i+1}/{len(selectors)}: {selector}")
-                element = await page.query_selector(selector)
-                
-                if element:
-                    # בדוק אם האלמנט נראה
-                    is_visible = await element.is_visible()
-                    is_enabled = await element.is_enabled()
-                    print(f"    📍 נמצא אלמנט - נראה: {is_visible}, פעיל: {is_enabled}")
-                    
-                    if is_visible and is_enabled:
-                        await element.fill(value)
-                        print(f"    ✅ מולא שדה {field_key} בהצלחה עם סלקטור: {selector}")
-                        
-                        # וודא שהערך נכנס
-                        current_value = await element.input_value()
-                        if current_value == value:
-                            print(f"    ✔️ אימות: הערך נשמר בהצלחה")
-                            return True
-                        else:
-                            print(f"    ⚠️ אזהרה: הערך לא נשמר כפי הצפוי (קיבלתי: '{current_value}')")
-                    else:
-                        print(f"    ⚠️ אלמנט נמצא אבל לא נגיש (visible: {is_visible}, enabled: {is_enabled})")
-                else:
-                    print(f"    ❌ אלמנט לא נמצא עם סלקטור: {selector}")
-                    
-            except Exception as e:
-                print(f"    💥 שגיאה עם סלקטור {selector}: {str(e)}")
-                continue
+        # fallback - השדה עוד לא מוכן או שהקלט מנוהל ע"י framework: מילוי דרך Playwright
+        try:
+            selector = await self._find_usable(page, university, field_key)
+            if selector is None:
+                logger.debug("❌ כשלון: לא הצלחתי למלא שדה %s עם אף אחד מהסלקטורים", field_key)
+                return False
+            
+            element = page.locator(selector).first
+            await element.fill(value)
+            logger.debug("    ✅ מולא שדה %s בהצלחה עם סלקטור: %s", field_key, selector)
+            
+            # וודא שהערך נכנס
+            current_value = await element.input_value()
+            if current_value == value:
+                logger.debug("    ✔️ אימות: הערך נשמר בהצלחה")
+                return True
+            
+            logger.debug("    ⚠️ אזהרה: הערך לא נשמר כפי הצפוי (קיבלתי: '%s')", current_value)
+        except Exception as e:
+            logger.debug("    💥 שגיאה במילוי שדה %s: %s", field_key, e)
         
-        print(f"❌ כשלון: לא הצלחתי למלא שדה {field_key} עם אף אחד מהסלקטורים")
+        logger.debug("❌ כשלון: לא הצלחתי למלא שדה %s עם אף אחד מהסלקטורים", field_key)
         return False
     
-    async def _try_click_button(self, page, config, button_key: str) -> bool:
+    async def _try_click_button(self, page, university: str, button_key: str) -> bool:
         """נסיון לחיצה על כפתור עם selector חלופיים - מעודכן עם לוגים מפורטים"""
-        print(f"🔍 מנסה ללחוץ על כפתור: {button_key}")
+        logger.debug("🔍 מנסה ללחוץ על כפתור: %s", button_key)
+        logger.debug("🎯 סלקטורים לבדיקה עבור %s: %s", button_key, self._selectors[university][button_key])
         
-        selectors = [config[button_key]]  # הסלקטור הבסיסי
-        
-        # הוספת סלקטורים חלופיים אם קיימים
-        if 'alternative_selectors' in config and button_key in config['alternative_selectors']:
-            selectors.extend(config['alternative_selectors'][button_key])
-        
-        print(f"🎯 סלקטורים לבדיקה עבור {button_key}: {selectors}")
-        
-        for i, selector in enumerate(selectors):
-            try:
-                print(f"  🔍 בודק סלקטור {i+1}/{len(selectors)}: {selector}")
-                element = await page.query_selector(selector)
-                
-                if element:
-                    # בדוק אם האלמנט נראה
-                    is_visible = await element.is_visible()
-                    is_enabled = await element.is_enabled()
-                    print(f"    📍 נמצא כפתור - נראה: {is_visible}, פעיל: {is_enabled}")
-                    
-                    if is_visible and is_enabled:
-                        await element.click()
-                        print(f"    ✅ נלחץ כפתור {button_key} בהצלחה עם סלקטור: {selector}")
-                        return True
-                    else:
-                        print(f"    ⚠️ כפתור נמצא אבל לא נגיש (visible: {is_visible}, enabled: {is_enabled})")
-                else:
-                    print(f"    ❌ כפתור לא נמצא עם סלקטור: {selector}")
-                    
-            except Exception as e:
-                print(f"    💥 שגיאה עם סלקטור {selector}: {str(e)}")
-                continue
+        try:
+            selector = await self._find_usable(page, university, button_key)
+            if selector is not None:
+                await page.locator(selector).first.click()
+                logger.debug("    ✅ נלחץ כפתור %s בהצלחה עם סלקטור: %s", button_key, selector)
+                return True
+            logger.debug("    ❌ לא נמצא כפתור נגיש עם אף סלקטור")
+        except Exception as e:
+            logger.debug("    💥 שגיאה בלחיצה על כפתור %s: %s", button_key, e)
         
         # אם לא הצלחנו ללחוץ על שום כפתור, נסה להגיש הטופס באמצעות Enter
-        print(f"🔄 לא מצאתי כפתור, מנסה להגיש טופס באמצעות Enter...")
+        logger.debug("🔄 לא מצאתי כפתור, מנסה להגיש טופס באמצעות Enter...")
         try:
             # נסה למצוא את שדה הסיסמה ולהקיש Enter
-            password_element = await page.query_selector(config['password_field'])
+            password_element = await page.query_selector(self._joined[university]['password_field'])
             if password_element:
                 await password_element.press('Enter')
-                print(f"    ✅ הגשתי טופס באמצעות Enter על שדה הסיסמה")
+                logger.debug("    ✅ הגשתי טופס באמצעות Enter על שדה הסיסמה")
                 return True
         except Exception as e:
-            print(f"    💥 שגיאה בהגשת טופס באמצעות Enter: {str(e)}")
+            logger.debug("    💥 שגיאה בהגשת טופס באמצעות Enter: %s", e)
         
-        print(f"❌ כשלון: לא הצלחתי ללחוץ על כפתור {button_key} או להגיש טופס")
+        logger.debug("❌ כשלון: לא הצלחתי ללחוץ על כפתור %s או להגיש טופס", button_key)
         return False
     
     async def _get_error_message(self, page, config) -> str:
@@ -422,14 +648,23 @@ async def main():
     parser.add_argument('--university', required=True, help='קוד האוניברסיטה (bgu/technion/huji)')
     parser.add_argument('--username', required=True, help='שם משתמש')
     parser.add_argument('--password', required=True, help='סיסמה')
+    parser.add_argument('--verbose', action='store_true', help='הדפסת לוגי דיבאג ל-stderr')
     
     args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
     
     validator = DevMoodleValidator()
-    result = await validator.validate(args.university, args.username, args.password)
+    try:
+        result = await validator.validate(args.university, args.username, args.password)
+    finally:
+        await validator.aclose()
     
-    # החזרת תוצאה כJSON לNode.js
-    print(json.dumps(result, ensure_ascii=False, indent=2))
+    # החזרת תוצאה כJSON לNode.js - bytes ישירות ל-stdout, בלי קידוד נוסף
+    if orjson:
+        sys.stdout.buffer.write(orjson.dumps(result) + b"\n")
+        sys.stdout.buffer.flush()
+    else:
+        print(json.dumps(result, ensure_ascii=False))
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
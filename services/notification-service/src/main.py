@@ -27,7 +27,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, EmailStr, ValidationError
 import aioredis
 import httpx
-import smtplib
+import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -60,6 +60,8 @@ SMTP_PORT = int(os.getenv('SMTP_PORT', '587'))
 SMTP_USERNAME = os.getenv('SMTP_USERNAME', '')
 SMTP_PASSWORD = os.getenv('SMTP_PASSWORD', '')
 FROM_EMAIL = os.getenv('FROM_EMAIL', 'no-reply@spike-platform.com')
+SMTP_POOL_SIZE = int(os.getenv('SMTP_POOL_SIZE', '5'))
+SMTP_MAX_MESSAGES_PER_CONNECTION = 100  # recycle long-lived sessions, like nodemailer's pool
 
 # SMS configuration (Twilio)
 TWILIO_ACCOUNT_SID = os.getenv('TWILIO_ACCOUNT_SID', '')
@@ -156,6 +158,12 @@ class NotificationResult:
     sent_at: datetime
     error_details: Optional[str] = None
 
+@dataclass
+class SMTPConnection:
+    """Pooled SMTP session - TLS and AUTH are paid once per connection, not per email"""
+    client: aiosmtplib.SMTP
+    messages_sent: int = 0
+
 class NotificationService:
     """שירות התראות עם תמיכה רב-ערוצית"""
 
@@ -164,6 +172,7 @@ class NotificationService:
         self.http_client: Optional[httpx.AsyncClient] = None
         self.templates_env: Optional[Environment] = None
         self.twilio_client: Optional[TwilioClient] = None
+        self.smtp_pool: Optional[asyncio.Queue] = None
 
     async def startup(self):
         """Initialize service connections"""
@@ -188,6 +197,27 @@ class NotificationService:
                 lstrip_blocks=True
             )
 
+            # Initialize the SMTP connection pool - connections are opened up front but
+            # an unreachable server only logs a warning; they reconnect on first use
+            self.smtp_pool = asyncio.Queue(maxsize=SMTP_POOL_SIZE)
+            connections = [
+                SMTPConnection(client=aiosmtplib.SMTP(
+                    hostname=SMTP_SERVER,
+                    port=SMTP_PORT,
+                    start_tls=True,
+                    timeout=30
+                ))
+                for _ in range(SMTP_POOL_SIZE)
+            ]
+            results = await asyncio.gather(
+                *(self._open_smtp_connection(conn) for conn in connections),
+                return_exceptions=True
+            )
+            for conn, result in zip(connections, results):
+                if isinstance(result, Exception):
+                    logger.warning(f"⚠️ SMTP connection not ready at startup: {result}")
+                self.smtp_pool.put_nowait(conn)
+
             # Initialize Twilio client for SMS
             if TWILIO_ACCOUNT_SID and TWILIO_AUTH_TOKEN:
                 self.twilio_client = TwilioClient(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
@@ -205,6 +235,9 @@ class NotificationService:
                 await self.redis.close()
             if self.http_client:
                 await self.http_client.aclose()
+            if self.smtp_pool:
+                while not self.smtp_pool.empty():
+                    await self._close_smtp_connection(self.smtp_pool.get_nowait())
 
             logger.info("🧹 Notification Service shutdown completed")
 
@@ -330,11 +363,8 @@ class NotificationService:
             msg.attach(text_part)
             msg.attach(html_part)
 
-            # Send email
-            with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-                server.starttls()
-                server.login(SMTP_USERNAME, SMTP_PASSWORD)
-                server.send_message(msg)
+            # Send email over a pooled, already-authenticated connection
+            await self._send_pooled(msg)
 
             notification_id = f"email_{recipient.user_id}_{int(datetime.utcnow().timestamp())}"
 
@@ -366,6 +396,47 @@ class NotificationService:
                 error_details=str(e)
             )
 
+    async def _open_smtp_connection(self, conn: SMTPConnection):
+        """התחברות, STARTTLS ו-AUTH לחיבור מהמאגר"""
+        await conn.client.connect()  # start_tls=True upgrades the session here
+        if SMTP_USERNAME:
+            try:
+                await conn.client.login(SMTP_USERNAME, SMTP_PASSWORD)
+            except aiosmtplib.SMTPException:
+                conn.client.close()  # never pool an unauthenticated session
+                raise
+        conn.messages_sent = 0
+
+    async def _close_smtp_connection(self, conn: SMTPConnection):
+        """Close a pooled connection, dropping it hard if QUIT fails"""
+        if not conn.client.is_connected:
+            return
+        try:
+            await conn.client.quit()
+        except aiosmtplib.SMTPException:
+            conn.client.close()
+
+    async def _send_pooled(self, msg: MIMEMultipart):
+        """שליחה על חיבור מהמאגר - חיבור שנסגר בצד השרת נפתח מחדש פעם אחת"""
+        conn = await self.smtp_pool.get()
+        try:
+            if conn.messages_sent >= SMTP_MAX_MESSAGES_PER_CONNECTION:
+                await self._close_smtp_connection(conn)
+            if not conn.client.is_connected:
+                await self._open_smtp_connection(conn)
+
+            try:
+                await conn.client.send_message(msg)
+            except (aiosmtplib.SMTPServerDisconnected, ConnectionError):
+                # Idle pooled sessions get dropped by the server - reconnect and retry once
+                await self._close_smtp_connection(conn)
+                await self._open_smtp_connection(conn)
+                await conn.client.send_message(msg)
+
+            conn.messages_sent += 1
+        finally:
+            self.smtp_pool.put_nowait(conn)
+
     async def send_push_notification(self, recipient: NotificationRecipient, content: NotificationContent, priority: NotificationPriority) -> NotificationResult:
         """Send push notification via Firebase/Apple Push"""
         try:
@@ -27,7 +27,7 @@ sys.path.append('/Users/ortaizi/Desktop/spike1-1/apps/scraper/src')
 
 try:
     from auth.smart_validator import SmartMoodleValidator, ValidationResult
-    from config.bgu_config_updated import BGUConfig, authenticate_bgu_with_fallback
+    from config.bgu_config_updated import BGUConfig, authenticate_bgu_with_fallback, shutdown_browsers
 except ImportError:
     # Fallback imports for development
     class SmartMoodleValidator:
@@ -164,6 +164,14 @@ class UniversityScraper:
 class BGUScraper(UniversityScraper):
     """סקרפר לאוניברסיטת בן גוריון"""
 
+    async def cleanup(self):
+        """Cleanup connections and the validator's shared browser/HTTP connector"""
+        try:
+            await super().cleanup()
+        finally:
+            # asyncio.run() opens a new loop per task - shared resources must not outlive it
+            await SmartMoodleValidator.shutdown()
+
     async def validate_credentials(self, username: str, password: str) -> ValidationResult:
         """Validate BGU credentials using existing smart validator"""
         try:
@@ -210,8 +218,9 @@ class BGUScraper(UniversityScraper):
                 page = await context.new_page()
 
                 try:
-                    # Login using existing BGU authenticator
-                    result = await authenticate_bgu_with_fallback(username, password, fast_mode=True)
+                    # Login using existing BGU authenticator - full timeouts and every fallback URL:
+                    # a background sync prefers a slow login over a false "authentication failed"
+                    result = await authenticate_bgu_with_fallback(username, password, fast_mode=False)
 
                     if not result.get('success'):
                         return {
@@ -245,6 +254,8 @@ class BGUScraper(UniversityScraper):
 
                 finally:
                     await browser.close()
+                    # The login browsers are shared per event loop and this task's loop ends here
+                    await shutdown_browsers()
 
         except Exception as e:
             logger.error(f"❌ BGU data extraction failed: {e}")